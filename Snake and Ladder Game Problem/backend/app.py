@@ -2,22 +2,29 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import time
-import random
 
+from board_pool import BoardPool
 from game_logic import SnakeLadderGame
+from simulator import simulate
 from database import (
     init_db,
     save_result_to_db,
-    save_performance,
+    save_performance_rows,
     get_performance
 )
-from validators import validate_n, validate_save_result
+from validators import validate_n, validate_games, validate_board, validate_save_result
 
 app = Flask(__name__)
 CORS(app)
 
 init_db()
 
+# ready boards for every N the API accepts, refilled in the background
+board_pool = BoardPool(range(6, 13), record=save_performance_rows)
+board_pool.start()
+
+GAME_STATS_BUDGET_S = 5.0 # simulation time one /api/game-stats request may use
+
 
 @app.route("/api/start-game", methods=["POST"])
 def start_game():
@@ -25,38 +32,49 @@ def start_game():
         data = request.json or {}
         n = validate_n(int(data.get("n", 10)))
 
-        game = SnakeLadderGame(n)
         run_id = int(time.time() * 1000)
+        board = board_pool.get(n, run_id)
+        board["run_id"] = run_id
+        return jsonify(board)
 
-        # BFS
-        t0 = time.perf_counter_ns()
-        ans = game.solve_bfs()
-        t1 = time.perf_counter_ns()
-        save_performance(run_id, "BFS", t1 - t0)
-
-        # Dijkstra
-        t0 = time.perf_counter_ns()
-        game.solve_dijkstra()
-        t1 = time.perf_counter_ns()
-        save_performance(run_id, "Dijkstra", t1 - t0)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        choices = {ans}
-        while len(choices) < 3:
-            fake = ans + random.randint(-3, 3)
-            if fake > 0:
-                choices.add(fake)
 
-        choices = list(choices)
-        random.shuffle(choices)
+@app.route("/api/game-stats", methods=["POST"])
+def game_stats():
+    # Monte Carlo statistics for the board sent back by the client, or for a
+    # fresh board of size n when none is given
+    try:
+        data = request.json or {}
+        n = validate_n(int(data.get("n", 10)))
+        games = validate_games(int(data.get("games", 100000)))
+        seed = data.get("seed")
+        if seed is not None:
+            seed = int(seed)
 
-        return jsonify({
+        game = SnakeLadderGame(n)
+        if "snakes" in data or "ladders" in data:
+            game.snakes, game.ladders = validate_board(data, game.board_size)
+            game.compile_board()
+
+        # a board where some games can never end has no statistics
+        correct_answer = game.solve_bfs()
+        expected = game.expected_throws()
+        if correct_answer == 0 or expected == float("inf"):
+            return jsonify({"error": "Some games on this board can never reach the last cell"}), 400
+
+        # one process, under a time budget: the request thread must not fork
+        # a pool or run unbounded
+        stats = simulate(game, games, seed=seed, processes=1, budget_s=GAME_STATS_BUDGET_S)
+        stats.update({
             "snakes": game.snakes,
             "ladders": game.ladders,
             "board_size": game.board_size,
-            "choices": choices,
-            "correct_answer": ans,
-            "run_id": run_id
+            "expected_throws": expected,
+            "correct_answer": correct_answer
         })
+        return jsonify(stats)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,112 @@
+# board_pool.py
+import collections
+import logging
+import random
+import threading
+import time
+
+from game_logic import SnakeLadderGame
+
+log = logging.getLogger(__name__)
+
+REFILL_RETRY_S = 1.0 # pause after a failed refill, so a failure that repeats does not spin
+
+
+def build_board(n):
+    # a ready-to-serve board: layout, answer, distractor choices and the
+    # solver timings (ns) to record once the board is handed out
+    game = SnakeLadderGame(n)
+
+    # BFS
+    t0 = time.perf_counter_ns()
+    ans = game.solve_bfs()
+    t1 = time.perf_counter_ns()
+    timings = [("BFS", t1 - t0)]
+
+    # Dijkstra
+    t0 = time.perf_counter_ns()
+    game.solve_dijkstra()
+    t1 = time.perf_counter_ns()
+    timings.append(("Dijkstra", t1 - t0))
+
+    choices = {ans}
+    while len(choices) < 3:
+        fake = ans + random.randint(-3, 3)
+        if fake > 0:
+            choices.add(fake)
+
+    choices = list(choices)
+    random.shuffle(choices)
+
+    return {
+        "snakes": game.snakes,
+        "ladders": game.ladders,
+        "board_size": game.board_size,
+        "choices": choices,
+        "correct_answer": ans,
+        "timings": timings
+    }
+
+
+class BoardPool:
+    """Keeps up to `capacity` ready boards for every N in `sizes`, so a
+    request only pops one. A single daemon thread refills the pools and
+    writes the solver timings of served boards through `record`, so neither
+    happens on the request path. A request for an empty pool builds its
+    board on the spot rather than waiting."""
+
+    def __init__(self, sizes, capacity=4, record=None):
+        self.capacity = capacity
+        self.record = record # record([(run_id, algo, time_ns), ...])
+        self._boards = {n: collections.deque() for n in sizes}
+        self._timings = collections.deque()
+        self._wake = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        with self._wake:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="board-pool", daemon=True)
+                self._thread.start()
+
+    def get(self, n, run_id):
+        # pops a ready board for N (or builds one) and queues its timings
+        # under run_id
+        try:
+            board = self._boards[n].popleft()
+        except (KeyError, IndexError):
+            board = build_board(n)
+        with self._wake:
+            self._timings.append([(run_id, algo, ns) for algo, ns in board["timings"]])
+            self._wake.notify()
+        return {k: v for k, v in board.items() if k != "timings"}
+
+    def ready(self, n):
+        return len(self._boards.get(n, ()))
+
+    def _work(self):
+        while True:
+            with self._wake:
+                while not self._timings and all(
+                    len(b) >= self.capacity for b in self._boards.values()
+                ):
+                    self._wake.wait()
+                timings = list(self._timings)
+                self._timings.clear()
+
+            # neither a lost chart sample nor a failed board may kill the
+            # thread: get() would then build every board on the request path
+            if timings and self.record is not None:
+                try:
+                    self.record([row for rows in timings for row in rows])
+                except Exception:
+                    log.exception("Recording solver timings failed")
+
+            try:
+                for n, boards in self._boards.items():
+                    while len(boards) < self.capacity:
+                        boards.append(build_board(n))
+            except Exception:
+                log.exception("Refilling the board pool failed")
+                with self._wake:
+                    self._wake.wait(REFILL_RETRY_S)
@@ -56,6 +56,18 @@ def save_performance(run_id, algo, time_ns):
     conn.close()
 
 
+def save_performance_rows(rows):
+    # rows: [(run_id, algo, time_ns), ...], written in one transaction
+    conn = get_connection()
+    c = conn.cursor()
+    c.executemany(
+        "INSERT INTO algo_performance1 (run_id, algo_name, time_ns) VALUES (?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
 def get_performance(limit=15):
     """
     Returns latest N rounds of performance data
@@ -1,38 +1,110 @@
 # game_logic.py
 import random
-import collections # for BFS
 import heapq # for Dijkstra's algorithm
+from array import array # flat jump table and transitions
+
+import numpy as np # for the Markov chain engine
+
+
+MAX_TRIES = 64 # draws allowed per snake/ladder before giving up on the board
 
 
 class SnakeLadderGame:
-    def __init__(self, n):
+    def __init__(self, n, seed=None, snake_density=None, ladder_density=None, min_length=1):
+        # By default a board has N - 2 snakes and N - 2 ladders; a density
+        # is the fraction of cells holding the start of a snake (ladder).
+        # min_length is the shortest allowed snake or ladder, in cells.
         self.N = n
         self.board_size = n * n
         self.snakes = {} # initialize an empty dictionary to map snake start → snake end
         self.ladders = {}
-        self._generate_board() # populate snakes and ladders
-
-    def _generate_board(self):
-        num_items = self.N - 2
-        occupied = {1, self.board_size}
-
-        # Ladders
-        count = 0
-        while count < num_items:
-            s, e = sorted(random.sample(range(2, self.board_size), 2))
-            if s not in occupied and e not in occupied:
-                self.ladders[s] = e
-                occupied.update({s, e})
-                count += 1
-
-        # Snakes
-        count = 0
-        while count < num_items:
-            e, s = sorted(random.sample(range(2, self.board_size), 2))  # snake: s > e
-            if s not in occupied and e not in occupied:
-                self.snakes[s] = e
-                occupied.update({s, e})
-                count += 1
+        self.rng = random.Random(seed)
+        self._generate_board(snake_density, ladder_density, min_length) # populate snakes and ladders
+        self.compile_board()
+
+    def _generate_board(self, snake_density=None, ladder_density=None, min_length=1):
+        # Endpoints are drawn from a lazily shuffled pool of the free cells
+        # 2..board_size-1 (a sparse Fisher-Yates shuffle), so a draw is O(1)
+        # and never returns an occupied cell. A pair that is too short, or a
+        # snake that would complete a wall of six snake heads in a row (a
+        # cell no throw could ever get past), goes back into the pool; every
+        # item gets at most MAX_TRIES draws, so generation always ends.
+        size = self.board_size
+        rng = self.rng
+        num_ladders = self.N - 2 if ladder_density is None else round(ladder_density * size)
+        num_snakes = self.N - 2 if snake_density is None else round(snake_density * size)
+        if num_ladders < 0 or num_snakes < 0 or 2 * (num_ladders + num_snakes) > size - 2:
+            raise ValueError("Too many snakes and ladders for the board")
+        if not 1 <= min_length < size - 2:
+            raise ValueError("Minimum length does not fit on the board")
+
+        swapped = {} # pool index -> cell, for the indices moved so far
+        remaining = size - 2
+
+        def draw():
+            nonlocal remaining
+            i = rng.randrange(remaining)
+            remaining -= 1
+            cell = swapped.get(i, i + 2)
+            swapped[i] = swapped.get(remaining, remaining + 2)
+            return cell
+
+        def put_back(cell):
+            nonlocal remaining
+            swapped[remaining] = cell
+            remaining += 1
+
+        def walls(head):
+            run = 1
+            for step in (-1, 1):
+                cell = head + step
+                while cell in self.snakes and run < 6:
+                    run += 1
+                    cell += step
+            return run >= 6
+
+        for items, count, is_snake in ((self.ladders, num_ladders, False), (self.snakes, num_snakes, True)):
+            for _ in range(count):
+                for _ in range(MAX_TRIES):
+                    low, high = sorted((draw(), draw()))
+                    if high - low >= min_length and not (is_snake and walls(high)):
+                        break
+                    put_back(high)
+                    put_back(low)
+                else:
+                    raise ValueError("Could not place the snakes and ladders; lower the density or minimum length")
+                if is_snake:
+                    items[high] = low # snake: start above end
+                else:
+                    items[low] = high
+
+    def compile_board(self):
+        # Flatten the board once for the solvers (call again after editing
+        # snakes/ladders by hand):
+        #   jump[c]     final cell after landing on c (c itself if plain)
+        #   indptr/indices  CSR transitions: the final cells of the throws
+        #                   from c are indices[indptr[c]:indptr[c + 1]]
+        # Cells are 'H' (2 bytes) up to 65535 cells, 'I' beyond that.
+        size = self.board_size
+        self.typecode = "H" if size <= 0xFFFF else "I"
+        jump = np.arange(size + 1, dtype=self.typecode)
+        for items in (self.ladders, self.snakes):
+            if items:
+                jump[list(items)] = list(items.values())
+
+        # throws from c land on c + 1..c + 6, fewer near the end; the last
+        # cell has no moves
+        counts = np.minimum(6, size - np.arange(size + 1))
+        counts[0] = 0
+        indptr = np.zeros(size + 2, dtype="I")
+        np.cumsum(counts, out=indptr[1:])
+        starts = np.repeat(indptr[:-1].astype(np.int64), counts)
+        rows = np.repeat(np.arange(size + 1), counts)
+        indices = jump[rows + (np.arange(len(rows)) - starts) + 1]
+
+        self.jump = array(self.typecode, jump.tobytes())
+        self.indptr = array("I", indptr.tobytes())
+        self.indices = array(self.typecode, indices.tobytes())
 
     def get_dest(self, cell): # returns the destination cell after applying snakes/ladders
         if cell in self.ladders:
@@ -42,41 +114,170 @@ class SnakeLadderGame:
         return cell
 
     def solve_bfs(self):   # BFS approach to find minimum dice throws
-        queue = collections.deque([(1, 0)])
-        visited = {1}
+        indptr, indices = self.indptr, self.indices
+        size = self.board_size
+        dist = array("i", [-1]) * (size + 1)
+        dist[1] = 0
+        queue = array(self.typecode, [1])
+        head = 0
 
-        while queue:
-            curr, throws = queue.popleft()
-            if curr == self.board_size:
-                return throws
+        while head < len(queue):
+            curr = queue[head]
+            head += 1
+            if curr == size:
+                return dist[curr]
 
-            for dice in range(1, 7):
-                nxt = curr + dice
-                if nxt <= self.board_size:
-                    final = self.get_dest(nxt)
-                    if final not in visited:
-                        visited.add(final)
-                        queue.append((final, throws + 1))
+            throws = dist[curr] + 1
+            for final in indices[indptr[curr]:indptr[curr + 1]]:
+                if dist[final] < 0:
+                    dist[final] = throws
+                    queue.append(final)
         return 0
 
     def solve_dijkstra(self): # Dijkstra's algorithm approach to find minimum dice throws
+        indptr, indices = self.indptr, self.indices
+        size = self.board_size
         pq = [(0, 1)]
-        dists = {i: float('inf') for i in range(1, self.board_size + 1)}
+        dists = array("i", [size + 1]) * (size + 1)  # more throws than any path needs
         dists[1] = 0
 
         while pq:
             d, curr = heapq.heappop(pq)
-            if curr == self.board_size:
+            if curr == size:
                 return d
 
             if d > dists[curr]:
                 continue
 
-            for dice in range(1, 7):
-                nxt = curr + dice
-                if nxt <= self.board_size:
-                    final = self.get_dest(nxt)
-                    if d + 1 < dists[final]:
-                        dists[final] = d + 1
-                        heapq.heappush(pq, (d + 1, final))
+            for final in indices[indptr[curr]:indptr[curr + 1]]:
+                if d + 1 < dists[final]:
+                    dists[final] = d + 1
+                    heapq.heappush(pq, (d + 1, final))
         return 0
+
+    def reaches_finish(self):
+        # reach[c] is 1 when the last cell can be reached from c: a BFS
+        # backwards from the finish over the reversed CSR transitions
+        size = self.board_size
+        indptr = np.frombuffer(self.indptr, dtype=self.indptr.typecode)
+        indices = np.frombuffer(self.indices, dtype=self.typecode)
+        # when every cell has a throw that moves it forward, climbing
+        # reaches the finish from anywhere and the BFS is not needed
+        ahead = np.maximum.reduceat(indices, indptr[1:size].astype(np.int64))
+        if np.all(ahead > np.arange(1, size)):
+            return bytearray(b"\x01") * (size + 1)
+
+        order = np.argsort(indices, kind="stable")
+        sources = np.repeat(np.arange(size + 1), np.diff(indptr))[order]
+        rev_indptr = np.zeros(size + 2, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=size + 1), out=rev_indptr[1:])
+        rev_indptr, sources = rev_indptr.tolist(), sources.tolist()
+
+        reach = bytearray(size + 1)
+        reach[size] = 1
+        queue = [size]
+        for curr in queue:
+            for prev in sources[rev_indptr[curr]:rev_indptr[curr + 1]]:
+                if not reach[prev]:
+                    reach[prev] = 1
+                    queue.append(prev)
+        return reach
+
+    def expected_throws(self):
+        # Exact expected number of throws from cell 1 to the last cell, as an
+        # absorbing Markov chain (a throw past the last cell is wasted).
+        # Sweeping the cells downwards, every E[c] is an affine function of
+        # the unknown E at the snake tails, since snakes are the only moves
+        # backwards; runs of plain cells between the cells we have to look
+        # at are crossed in one step with a power of the banded 7x7 update.
+        # A small dense system over the snake tails then gives the exact
+        # answer. Returns inf when the finish cannot be reached from cell 1
+        # or from a snake tail, as then some games never end.
+        size = self.board_size
+        jump = np.frombuffer(self.jump, dtype=self.typecode).astype(np.int64)
+        cells = np.arange(size + 1)
+        heads = np.nonzero(jump != cells)[0]
+        tails = np.unique(jump[jump < cells])
+        reach = self.reaches_finish()
+        if not reach[1] or not all(reach[t] for t in tails.tolist()):
+            return float("inf")
+        column = {int(t): i for i, t in enumerate(tails)}
+        width = len(tails) + 1  # one coefficient per tail, then the constant
+        const = np.zeros(width)
+        const[-1] = 1.0
+
+        stored = {int(jump[h]) for h in heads if jump[h] > h}  # ladder tops
+        special = stored | set(column) | {int(h) for h in heads} | {1}
+        special |= set(range(max(1, size - 6), size + 1))
+        special = sorted(special, reverse=True)
+
+        # rows 0..5 hold V(c+1)..V(c+6), the value of landing on those
+        # cells; row 6 is the constant, so one plain cell is window = S @ window
+        window = np.zeros((7, width))
+        window[6] = const
+        step = np.zeros((7, 7))
+        step[0, :6] = 1.0 / 6.0
+        step[0, 6] = 1.0
+        step[1:6, :5] = np.eye(5)
+        step[6, 6] = 1.0
+
+        values = {}
+        tail_rows = np.zeros((len(tails), width))
+        c = size
+        for cell in special:
+            if cell < c:
+                window = np.linalg.matrix_power(step, c - cell) @ window
+            c = cell
+            k = min(6, size - c)  # throws that stay on the board
+            e = (6.0 * const + window[:k].sum(axis=0)) / k if k else np.zeros(width)
+            if c in stored:
+                values[c] = e
+            if c in column:
+                tail_rows[column[c]] = e
+            if c == 1:
+                start = e
+            if jump[c] > c:
+                e = values[int(jump[c])]
+            elif jump[c] < c:
+                e = np.zeros(width)
+                e[column[int(jump[c])]] = 1.0
+            window[1:6] = window[0:5]
+            window[0] = e
+            c -= 1
+
+        if not len(tails):
+            return float(start[-1])
+        system = np.eye(len(tails)) - tail_rows[:, :-1]
+        x = np.linalg.solve(system, tail_rows[:, -1])
+        return float(start[:-1] @ x + start[-1])
+
+    def throw_distribution(self, turns):
+        # P(the game ends on throw t) for t = 1..turns, pushing the position
+        # distribution forward one throw at a time: the six throws are
+        # shifted slices (the band of the transition matrix) and only the
+        # mass landing on a snake or ladder is then moved, so a throw costs
+        # O(cells + items). The mass still on the board after `turns`
+        # throws is 1 - sum(result).
+        size = self.board_size
+        jump = np.frombuffer(self.jump, dtype=self.typecode)
+        heads = np.nonzero(jump != np.arange(size + 1))[0]
+        ends = jump[heads].astype(np.int64)
+        counts = np.diff(np.frombuffer(self.indptr, dtype=self.indptr.typecode))
+        stay = (6 - counts[:size]) / 6.0  # wasted throws near the finish
+
+        p = np.zeros(size + 1)
+        p[1] = 1.0
+        result = []
+        for _ in range(turns):
+            nxt = np.zeros(size + 1)
+            for dice in range(1, 7):
+                nxt[1 + dice:] += p[1:size + 1 - dice]
+            moved = nxt[heads]
+            nxt[heads] = 0.0
+            np.add.at(nxt, ends, moved)
+            nxt /= 6.0
+            nxt[:size] += p[:size] * stay
+            result.append(float(nxt[size]))
+            nxt[size] = 0.0
+            p = nxt
+        return result
@@ -0,0 +1,101 @@
+# simulator.py
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+CHUNK_GAMES = 1 << 18 # games advanced together in one lock-step batch
+MAX_TURNS_PER_CELL = 20 # games still running after this many throws per cell are dropped
+
+
+def _simulate_chunk(job):
+    # Plays `games` games in lock-step: one throw for every running game
+    # per iteration, finished games are dropped from the arrays. Games
+    # still running at `deadline` (time.monotonic()) are left unfinished.
+    jump, heads, games, seed, max_turns, deadline = job
+    size = len(jump) - 1
+    rng = np.random.default_rng(seed)
+    head_index = np.full(size + 1, -1, dtype=np.int64)
+    head_index[heads] = np.arange(len(heads))
+
+    lengths = np.zeros(max_turns + 1, dtype=np.int64)
+    visits = np.zeros(size + 1, dtype=np.int64)
+    visits[1] = games
+    hits = np.zeros(len(heads), dtype=np.int64)
+
+    pos = np.ones(games, dtype=jump.dtype)
+    timed_out = False
+    for turn in range(1, max_turns + 1):
+        if not len(pos):
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            timed_out = True
+            break
+        nxt = pos + rng.integers(1, 7, size=len(pos), dtype=pos.dtype)
+        nxt = np.where(nxt <= size, nxt, pos) # a throw past the end is wasted
+
+        landed = head_index[nxt]
+        hits += np.bincount(landed[landed >= 0], minlength=len(heads))
+        pos = jump[nxt]
+        visits += np.bincount(pos, minlength=size + 1)
+
+        done = pos == size
+        lengths[turn] = np.count_nonzero(done)
+        pos = pos[~done]
+
+    return lengths, visits, hits, len(pos), timed_out
+
+
+def simulate(game, games=100000, seed=None, processes=None, max_turns=None, budget_s=None):
+    # Monte Carlo statistics of `games` full games on the board of `game`.
+    # The games are split into chunks with their own seeds spawned from
+    # `seed`, so a seeded run gives the same numbers for any `processes`.
+    # processes=None uses one process per chunk, up to the CPU count.
+    # Games are cut off after max_turns throws (MAX_TURNS_PER_CELL per
+    # board cell by default) or when budget_s seconds have passed, and are
+    # then counted as unfinished.
+    jump = np.frombuffer(game.jump, dtype=game.typecode).astype(np.int64)
+    heads = np.nonzero(jump != np.arange(len(jump)))[0]
+    if max_turns is None:
+        max_turns = MAX_TURNS_PER_CELL * game.board_size
+    deadline = time.monotonic() + budget_s if budget_s is not None else None
+
+    sizes = [min(CHUNK_GAMES, games - i) for i in range(0, games, CHUNK_GAMES)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(jump, heads, n, s, max_turns, deadline) for n, s in zip(sizes, seeds)]
+
+    if processes is None:
+        processes = min(len(jobs), os.cpu_count() or 1)
+    if processes > 1 and len(jobs) > 1:
+        with multiprocessing.Pool(processes) as pool:
+            parts = pool.map(_simulate_chunk, jobs)
+    else:
+        parts = [_simulate_chunk(job) for job in jobs]
+
+    lengths = sum(p[0] for p in parts)
+    visits = sum(p[1] for p in parts)
+    hits = sum(p[2] for p in parts)
+    unfinished = sum(p[3] for p in parts)
+    timed_out = any(p[4] for p in parts)
+
+    finished = games - unfinished
+    last = int(np.nonzero(lengths)[0][-1]) if finished else 0
+    throws = np.arange(len(lengths))
+    rate = {int(h): float(c) / games for h, c in zip(heads, hits)}
+
+    return {
+        "games": games,
+        "unfinished": int(unfinished),
+        "timed_out": timed_out,
+        "mean_throws": float(lengths @ throws) / finished if finished else None,
+        "min_throws": int(np.nonzero(lengths)[0][0]) if finished else None,
+        "max_throws": last if finished else None,
+        # length_histogram[t]: games that ended on throw t
+        "length_histogram": lengths[:last + 1].tolist(),
+        # visit_frequency[c]: times a game stood on cell c, per game
+        "visit_frequency": (visits / games).tolist(),
+        # landings on each snake head / ladder foot, per game
+        "snake_hits": {h: r for h, r in rate.items() if h in game.snakes},
+        "ladder_hits": {h: r for h, r in rate.items() if h in game.ladders},
+    }
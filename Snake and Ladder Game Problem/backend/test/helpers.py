@@ -0,0 +1,10 @@
+# helpers.py: boards shared by the test modules
+from game_logic import SnakeLadderGame
+
+
+def fixed_board():
+    # a 6x6 board with two snakes and two ladders, compiled for the solvers
+    game = SnakeLadderGame(6)
+    game.snakes, game.ladders = {30: 4, 17: 9}, {3: 22, 12: 28}
+    game.compile_board()
+    return game
@@ -19,6 +19,34 @@ def test_start_game_invalid_n(client):
     assert "error" in response.get_json()
 
 
+def test_game_stats(client):
+    response = client.post("/api/game-stats", json={
+        "n": 6,
+        "games": 2000,
+        "seed": 1,
+        "snakes": {"30": 4},
+        "ladders": {"3": 22}
+    })
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["games"] == 2000
+    assert sum(data["length_histogram"]) == 2000
+    assert data["min_throws"] >= data["correct_answer"]
+    assert data["expected_throws"] > 0
+
+
+def test_game_stats_unwinnable_board(client):
+    response = client.post("/api/game-stats", json={
+        "n": 6,
+        "games": 2000,
+        "snakes": {str(c): 2 for c in range(20, 26)}
+    })
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
 def test_save_result(client):
     response = client.post("/api/save-result", json={
         "name": "TestUser",
@@ -0,0 +1,61 @@
+import time
+
+import board_pool
+from board_pool import BoardPool, build_board
+
+
+def _wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_build_board():
+    board = build_board(8)
+    assert board["board_size"] == 64
+    assert board["correct_answer"] in board["choices"]
+    assert len(board["choices"]) == 3
+    assert [algo for algo, _ in board["timings"]] == ["BFS", "Dijkstra"]
+
+
+def test_pool_refills_and_records_timings():
+    recorded = []
+    pool = BoardPool([6, 7], capacity=2, record=recorded.extend)
+    pool.start()
+    assert _wait_for(lambda: pool.ready(6) == 2 and pool.ready(7) == 2)
+
+    board = pool.get(6, run_id=42)
+    assert "timings" not in board
+    assert board["board_size"] == 36
+    assert _wait_for(lambda: len(recorded) == 2 and pool.ready(6) == 2)
+    assert {(run_id, algo) for run_id, algo, _ in recorded} == {(42, "BFS"), (42, "Dijkstra")}
+
+
+def test_pool_builds_on_the_spot_when_empty():
+    pool = BoardPool([6], capacity=1)  # never started
+    assert pool.get(9, run_id=1)["board_size"] == 81
+
+
+def test_pool_survives_failing_builds_and_records(monkeypatch):
+    failures = []
+
+    def flaky_build(n):
+        if len(failures) < 2:
+            failures.append(n)
+            raise RuntimeError("board generation failed")
+        return build_board(n)
+
+    def broken_record(rows):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(board_pool, "build_board", flaky_build)
+    monkeypatch.setattr(board_pool, "REFILL_RETRY_S", 0.01)
+    pool = BoardPool([6], capacity=2, record=broken_record)
+    pool.start()
+    assert _wait_for(lambda: pool.ready(6) == 2)
+    assert len(failures) == 2
+
+    pool.get(6, run_id=1)
+    assert _wait_for(lambda: pool.ready(6) == 2)
+    assert pool._thread.is_alive()
@@ -1,4 +1,6 @@
+import pytest
 from app import SnakeLadderGame
+from helpers import fixed_board
 
 def test_board_creation():
     game = SnakeLadderGame(8)
@@ -29,3 +31,112 @@ def test_dijkstra_solution():
     result = game.solve_dijkstra()
     assert isinstance(result, int)
     assert result > 0
+
+
+def _reference_bfs(game):
+    # plain BFS over get_dest, independent of the compiled board
+    dist = {1: 0}
+    frontier = [1]
+    while frontier:
+        nxt_frontier = []
+        for curr in frontier:
+            for dice in range(1, 7):
+                if curr + dice <= game.board_size:
+                    final = game.get_dest(curr + dice)
+                    if final not in dist:
+                        dist[final] = dist[curr] + 1
+                        nxt_frontier.append(final)
+        frontier = nxt_frontier
+    return dist.get(game.board_size, 0)
+
+
+def test_compiled_board_matches_dicts():
+    game = SnakeLadderGame(10)
+    for cell in range(1, game.board_size + 1):
+        assert game.jump[cell] == game.get_dest(cell)
+        moves = list(game.indices[game.indptr[cell]:game.indptr[cell + 1]])
+        expected = [game.get_dest(c) for c in range(cell + 1, min(cell + 6, game.board_size) + 1)]
+        assert moves == expected
+
+
+def test_solvers_agree_with_reference():
+    for n in range(6, 13):
+        game = SnakeLadderGame(n)
+        expected = _reference_bfs(game)
+        assert game.solve_bfs() == expected
+        assert game.solve_dijkstra() == expected
+
+
+def test_compile_board_after_manual_edit():
+    game = SnakeLadderGame(6)
+    game.snakes, game.ladders = {}, {2: 35}
+    game.compile_board()
+    assert game.solve_bfs() == 2
+    assert game.solve_dijkstra() == 2
+
+
+def _reference_expected(game, sweeps=5000):
+    # value iteration on E[c] = 1 + mean over throws, wasted throws stay put
+    size = game.board_size
+    e = [0.0] * (size + 1)
+    for _ in range(sweeps):
+        for c in range(size - 1, 0, -1):
+            total = sum(e[game.get_dest(c + d)] if c + d <= size else e[c] for d in range(1, 7))
+            e[c] = 1 + total / 6
+    return e[1]
+
+
+def test_expected_throws_matches_reference():
+    game = fixed_board()
+    assert abs(game.expected_throws() - _reference_expected(game)) < 1e-6
+
+
+def test_expected_throws_walled_board():
+    # six snake heads in a row: no game gets past cell 19
+    game = SnakeLadderGame(6)
+    game.snakes, game.ladders = {c: 2 for c in range(20, 26)}, {}
+    game.compile_board()
+    assert game.solve_bfs() == 0
+    assert not game.reaches_finish()[1]
+    assert game.expected_throws() == float("inf")
+
+
+def test_throw_distribution():
+    game = fixed_board()
+    dist = game.throw_distribution(1000)
+    first = next(t for t, p in enumerate(dist, 1) if p > 0)
+    assert first == game.solve_bfs()
+    assert abs(sum(dist) - 1) < 1e-6
+    mean = sum(t * p for t, p in enumerate(dist, 1))
+    assert abs(mean - game.expected_throws()) < 1e-2
+
+
+def test_generator_is_seeded_and_consistent():
+    game = SnakeLadderGame(12, seed=3)
+    assert game.snakes == SnakeLadderGame(12, seed=3).snakes
+    assert len(game.snakes) == len(game.ladders) == 10
+    cells = list(game.snakes) + list(game.snakes.values()) + list(game.ladders) + list(game.ladders.values())
+    assert len(set(cells)) == len(cells)  # no cell starts or ends two items
+    assert all(1 < c < game.board_size for c in cells)
+    assert all(s > e for s, e in game.snakes.items())
+    assert all(s < e for s, e in game.ladders.items())
+
+
+def test_generator_density_and_min_length():
+    game = SnakeLadderGame(20, seed=1, snake_density=0.1, ladder_density=0.05, min_length=15)
+    assert len(game.snakes) == 40 and len(game.ladders) == 20
+    assert all(s - e >= 15 for s, e in game.snakes.items())
+    assert all(e - s >= 15 for s, e in game.ladders.items())
+    heads = sorted(game.snakes)
+    assert not any(heads[i + 5] - heads[i] == 5 for i in range(len(heads) - 5))
+
+
+def test_generator_rejects_overfull_board():
+    with pytest.raises(ValueError):
+        SnakeLadderGame(6, snake_density=0.3, ladder_density=0.3)
+
+
+def test_generator_large_board():
+    game = SnakeLadderGame(1000, seed=0)
+    assert len(game.snakes) == len(game.ladders) == 998
+    assert len(game.jump) == 1000 * 1000 + 1
@@ -0,0 +1,35 @@
+from game_logic import SnakeLadderGame
+from simulator import simulate
+
+from helpers import fixed_board
+
+
+def test_simulate_matches_exact_values():
+    game = fixed_board()
+    stats = simulate(game, 200000, seed=1, processes=1)
+    assert stats["unfinished"] == 0
+    assert not stats["timed_out"]
+    assert sum(stats["length_histogram"]) == 200000
+    assert stats["min_throws"] == game.solve_bfs()
+    assert abs(stats["mean_throws"] - game.expected_throws()) < 0.1
+    assert set(stats["snake_hits"]) == {30, 17}
+    assert set(stats["ladder_hits"]) == {3, 12}
+    assert stats["visit_frequency"][1] >= 1
+    assert stats["visit_frequency"][30] == 0  # nobody stays on a snake head
+
+
+def test_simulate_is_seeded():
+    game = fixed_board()
+    assert simulate(game, 5000, seed=7) == simulate(game, 5000, seed=7)
+
+
+def test_simulate_caps_turns_and_time():
+    game = SnakeLadderGame(6)
+    game.snakes, game.ladders = {c: 2 for c in range(20, 26)}, {}
+    game.compile_board()
+    stats = simulate(game, 1000, seed=1, processes=1)
+    assert stats["unfinished"] == 1000
+    assert stats["mean_throws"] is None
+    stats = simulate(game, 1000, seed=1, processes=1, max_turns=10**6, budget_s=0.05)
+    assert stats["unfinished"] == 1000
+    assert stats["timed_out"]
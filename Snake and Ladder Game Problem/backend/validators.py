@@ -9,6 +9,32 @@ def validate_n(n):
     return n
 
 
+def validate_games(games):
+    if not isinstance(games, int):
+        raise ValueError("Number of games must be a number")
+    if games < 1 or games > 5_000_000:
+        raise ValueError("Number of games must be between 1 and 5000000")
+    return games
+
+
+def validate_board(data, board_size):
+    # snakes/ladders as sent back by the client: {"start": end}, JSON keys
+    # being strings
+    snakes = {int(s): int(e) for s, e in data.get("snakes", {}).items()}
+    ladders = {int(s): int(e) for s, e in data.get("ladders", {}).items()}
+
+    for s, e in list(snakes.items()) + list(ladders.items()):
+        if not (1 < s < board_size and 1 < e < board_size):
+            raise ValueError("Snakes and ladders must lie inside the board")
+    if any(e >= s for s, e in snakes.items()):
+        raise ValueError("A snake must lead down")
+    if any(e <= s for s, e in ladders.items()):
+        raise ValueError("A ladder must lead up")
+    if set(snakes) & set(ladders):
+        raise ValueError("A cell can hold only one snake or ladder")
+    return snakes, ladders
+
+
 def validate_save_result(data):
     # Check required fields
     if "name" not in data or not data["name"].strip():
@@ -6,7 +6,7 @@ CREATE TABLE IF NOT EXISTS players (
 CREATE TABLE IF NOT EXISTS sessions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     home_city TEXT NOT NULL,
-    distance_matrix TEXT NOT NULL,
+    distance_matrix BLOB NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -22,24 +22,44 @@ CREATE TABLE IF NOT EXISTS games (
     FOREIGN KEY(session_id) REFERENCES sessions(id)
 );
 
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,
+    player_id INTEGER,
+    cities INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY(session_id) REFERENCES sessions(id),
+    FOREIGN KEY(player_id) REFERENCES players(id)
+);
+
 CREATE TABLE IF NOT EXISTS algorithm_runs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     session_id INTEGER NOT NULL,
+    check_id INTEGER,
     algorithm_name TEXT NOT NULL,
     duration_ms REAL NOT NULL,
     distance INTEGER NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(session_id) REFERENCES sessions(id)
+    FOREIGN KEY(session_id) REFERENCES sessions(id),
+    FOREIGN KEY(check_id) REFERENCES checks(id)
 );
 
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME
+);
 
+CREATE INDEX IF NOT EXISTS idx_algorithm_runs_session ON algorithm_runs (session_id, algorithm_name);
 
+CREATE INDEX IF NOT EXISTS idx_algorithm_runs_check ON algorithm_runs (check_id, algorithm_name);
 
+CREATE INDEX IF NOT EXISTS idx_games_session ON games (session_id);
 
-
-
-
-
-
-
-
+CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at);
@@ -1,8 +1,19 @@
 # algorithms.py
+import collections
+import concurrent.futures
+import functools
+import heapq
+import inspect
+import math
+import multiprocessing
 import random
+import struct
+import threading
 import time
-from itertools import permutations
-from typing import List, Dict, Any
+from itertools import islice, permutations
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
 
 
 def generate_random_matrix(n: int = 10, low: int = 50, high: int = 100) -> List[List[int]]:
@@ -20,6 +31,392 @@ def generate_random_matrix(n: int = 10, low: int = 50, high: int = 100) -> List[
     return matrix
 
 
+class CondensedMatrix:
+    # Symmetric distance matrix stored as its upper triangle (i < j) in a
+    # 1-D NumPy buffer: n * (n - 1) / 2 values instead of n * n.
+    # matrix[i][j] works like a list of lists, so every engine accepts it.
+
+    _HEADER = struct.Struct("<I3s")
+
+    def __init__(self, n: int, data: "np.ndarray"):
+        if len(data) != n * (n - 1) // 2:
+            raise ValueError(f"condensed buffer for n={n} must hold {n * (n - 1) // 2} values")
+        self.n = n
+        self.data = data
+        self._neighbours: Optional["np.ndarray"] = None
+
+    @classmethod
+    def random(
+        cls, n: int = 10, low: int = 50, high: int = 100, seed: Optional[int] = None
+    ) -> "CondensedMatrix":
+        rng = np.random.default_rng(seed)
+        dtype = np.uint16 if high < 2 ** 16 else np.int64
+        return cls(n, rng.integers(low, high, size=n * (n - 1) // 2, endpoint=True, dtype=dtype))
+
+    @classmethod
+    def from_square(cls, matrix: List[List[int]]) -> "CondensedMatrix":
+        square = np.asarray(matrix)
+        n = len(square)
+        data = square[np.triu_indices(n, 1)]
+        if data.dtype.kind in "iu" and (len(data) == 0 or (data.min() >= 0 and data.max() < 2 ** 16)):
+            data = data.astype(np.uint16)
+        return cls(n, data)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "CondensedMatrix":
+        n, dtype = cls._HEADER.unpack_from(blob)
+        data = np.frombuffer(blob, dtype=np.dtype(dtype.decode()), offset=cls._HEADER.size)
+        if len(data) != n * (n - 1) // 2:
+            raise ValueError("blob does not hold a condensed matrix")
+        return cls(n, data)
+
+    def to_bytes(self) -> bytes:
+        dtype = self.data.dtype.newbyteorder("<")
+        header = self._HEADER.pack(self.n, dtype.str.encode())
+        return header + self.data.astype(dtype, copy=False).tobytes()
+
+    def save(self, path: str) -> None:
+        # same layout as to_bytes, written without building the blob in memory
+        dtype = self.data.dtype.newbyteorder("<")
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self.n, dtype.str.encode()))
+            self.data.astype(dtype, copy=False).tofile(f)
+
+    @classmethod
+    def mmap(cls, path: str) -> "CondensedMatrix":
+        # read-only memory map of a file written by save(): nothing is loaded
+        # until the pages are touched
+        with open(path, "rb") as f:
+            n, dtype = cls._HEADER.unpack(f.read(cls._HEADER.size))
+        if n < 2:
+            return cls(n, np.zeros(0, dtype=np.dtype(dtype.decode())))
+        data = np.memmap(path, dtype=np.dtype(dtype.decode()), mode="r", offset=cls._HEADER.size)
+        return cls(n, data)
+
+    def index(self, i: int, j: int) -> int:
+        if i > j:
+            i, j = j, i
+        return self.n * i - i * (i + 1) // 2 + (j - i - 1)
+
+    def d(self, i: int, j: int) -> int:
+        if i == j:
+            return 0
+        return int(self.data[self.index(i, j)])
+
+    def submatrix(self, nodes: List[int]) -> List[List[int]]:
+        idx = np.asarray(nodes, dtype=np.intp)
+        i, j = np.minimum.outer(idx, idx), np.maximum.outer(idx, idx)
+        flat = self.n * i - i * (i + 1) // 2 + (j - i - 1)
+        same = i == j
+        flat[same] = 0
+        if len(self.data) == 0:
+            return np.zeros(flat.shape, dtype=np.int64).tolist()
+        sub = self.data[flat].astype(np.int64)
+        sub[same] = 0
+        return sub.tolist()
+
+    def tolist(self) -> List[List[int]]:
+        return self.submatrix(list(range(self.n)))
+
+    def neighbours(self, k: int) -> "np.ndarray":
+        # (n, k) nearest cities of every city, nearest first; computed a
+        # block of rows at a time so no n x n buffer is built, then cached
+        k = min(k, self.n - 1)
+        if self._neighbours is None or self._neighbours.shape[1] < k:
+            out = np.empty((self.n, max(k, 0)), dtype=np.intp)
+            cols = np.arange(self.n)
+            block = max(1, 2 ** 22 // max(self.n, 1))
+            for start in range(0, self.n if k > 0 else 0, block):
+                rows = np.arange(start, min(start + block, self.n))
+                i, j = np.minimum.outer(rows, cols), np.maximum.outer(rows, cols)
+                flat = self.n * i - i * (i + 1) // 2 + (j - i - 1)
+                dist = self.data[np.where(i == j, 0, flat)].astype(np.float64)
+                out[rows] = _nearest_k(dist, k, rows)
+            self._neighbours = out
+        return self._neighbours[:, :k]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> "_CondensedRow":
+        return _CondensedRow(self, i)
+
+
+def _nearest_k(dist: "np.ndarray", k: int, self_cols: Optional["np.ndarray"] = None) -> "np.ndarray":
+    # column indices of the k smallest entries of each row, excluding the
+    # row's own column, ordered by (distance, index): one argpartition
+    # instead of a full sort per row
+    dist = np.array(dist, dtype=np.float64)
+    rows = np.arange(len(dist))
+    dist[rows, rows if self_cols is None else self_cols] = np.inf
+    part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    rank = np.lexsort((part, np.take_along_axis(dist, part, axis=1)), axis=1)
+    return np.take_along_axis(part, rank, axis=1)
+
+
+class _CondensedRow:
+    __slots__ = ("matrix", "i")
+
+    def __init__(self, matrix: "CondensedMatrix | EuclideanInstance", i: int):
+        self.matrix = matrix
+        self.i = i
+
+    def __getitem__(self, j: int) -> int:
+        return self.matrix.d(self.i, j)
+
+    def __len__(self) -> int:
+        return self.matrix.n
+
+
+class EuclideanInstance:
+    # Cities as points in the plane. Distances are computed on demand from
+    # the Euclidean length r, so no n x n table is ever held; matrix[i][j]
+    # works like CondensedMatrix. The metric picks TSPLIB's integer rounding:
+    # "euc_2d" nint(r), "ceil_2d" ceil(r), "att" pseudo-Euclidean ceil-ish
+    # of r / sqrt(10). All are non-decreasing in r, so the k-d tree's nearest
+    # points are nearest under the metric too.
+
+    METRICS = ("euc_2d", "ceil_2d", "att")
+
+    def __init__(self, xy, metric: str = "euc_2d"):
+        xy = np.asarray(xy, dtype=np.float64)
+        if xy.ndim != 2 or xy.shape[1] != 2:
+            raise ValueError("coordinates must be an (n, 2) array")
+        if metric not in self.METRICS:
+            raise ValueError(f"unknown metric {metric!r}")
+        self.metric = metric
+        self.xy = xy
+        self.n = len(xy)
+        self.xs = xy[:, 0].tolist()
+        self.ys = xy[:, 1].tolist()
+        self._neighbours: Optional["np.ndarray"] = None
+
+    @classmethod
+    def random(cls, n: int = 10, size: float = 1000.0, seed: Optional[int] = None) -> "EuclideanInstance":
+        rng = np.random.default_rng(seed)
+        return cls(rng.uniform(0.0, size, size=(n, 2)))
+
+    def d(self, i: int, j: int) -> int:
+        r = math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j])
+        if self.metric == "euc_2d":
+            return int(r + 0.5)
+        if self.metric == "ceil_2d":
+            return math.ceil(r)
+        r /= math.sqrt(10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+
+    def lengths(self, delta: "np.ndarray") -> "np.ndarray":
+        # vectorised d() for an array of coordinate differences (..., 2)
+        r = np.hypot(delta[..., 0], delta[..., 1])
+        if self.metric == "euc_2d":
+            return np.floor(r + 0.5).astype(np.int64)
+        if self.metric == "ceil_2d":
+            return np.ceil(r).astype(np.int64)
+        r = r / math.sqrt(10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t).astype(np.int64)
+
+    def submatrix(self, nodes: List[int]) -> List[List[int]]:
+        pts = self.xy[np.asarray(nodes, dtype=np.intp)]
+        return self.lengths(pts[:, None, :] - pts[None, :, :]).tolist()
+
+    def tree(self, nodes: List[int]) -> "_KDTree":
+        # spatial index over `nodes`; the tree's point ids are positions in `nodes`
+        pts = self.xy[np.asarray(nodes, dtype=np.intp)]
+        return _KDTree(pts[:, 0], pts[:, 1])
+
+    def tolist(self) -> List[List[int]]:
+        return self.submatrix(list(range(self.n)))
+
+    def neighbours(self, k: int) -> "np.ndarray":
+        # (n, k) nearest cities of every city from the k-d tree, cached
+        k = min(k, self.n - 1)
+        if self._neighbours is None or self._neighbours.shape[1] < k:
+            self._neighbours = self.tree(list(range(self.n))).k_nearest_all(k)
+        return self._neighbours[:, :k]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> "_CondensedRow":
+        return _CondensedRow(self, i)
+
+
+class _KDTree:
+    # 2-d tree with leaf buckets. Points can be removed: every node keeps a
+    # live count and searches skip emptied subtrees, so nearest-unvisited
+    # queries stay around O(log n) until the last city of a tour.
+
+    def __init__(self, xs, ys, bucket: int = 8):
+        X = np.asarray(xs, dtype=np.float64)
+        Y = np.asarray(ys, dtype=np.float64)
+        n = len(X)
+        self.xs = X.tolist()
+        self.ys = Y.tolist()
+        self.alive = [True] * n
+        self.leaf_of = [0] * n
+        self.lo: List[int] = []
+        self.hi: List[int] = []
+        self.box: List[Tuple[float, float, float, float]] = []
+        self.dim: List[int] = []
+        self.split: List[float] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.parent: List[int] = []
+        self.count: List[int] = []
+
+        order = np.arange(n)
+        stack = [(0, n, -1, False)]
+        while stack:
+            lo, hi, parent, is_right = stack.pop()
+            node = len(self.lo)
+            if parent >= 0:
+                (self.right if is_right else self.left)[parent] = node
+            seg = order[lo:hi]
+            px, py = X[seg], Y[seg]
+            if hi > lo:
+                box = (float(px.min()), float(py.min()), float(px.max()), float(py.max()))
+            else:
+                box = (math.inf, math.inf, -math.inf, -math.inf)
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self.box.append(box)
+            self.parent.append(parent)
+            self.count.append(hi - lo)
+            self.left.append(-1)
+            self.right.append(-1)
+            if hi - lo <= bucket:
+                self.dim.append(0)
+                self.split.append(0.0)
+                for p in seg.tolist():
+                    self.leaf_of[p] = node
+                continue
+            dim = 0 if box[2] - box[0] >= box[3] - box[1] else 1
+            vals = px if dim == 0 else py
+            mid = (hi - lo) // 2
+            part = np.argpartition(vals, mid)
+            order[lo:hi] = seg[part]
+            self.dim.append(dim)
+            self.split.append(float(vals[part[mid]]))
+            stack.append((lo + mid, hi, node, True))
+            stack.append((lo, lo + mid, node, False))
+        self._order = order
+        self.order = order.tolist()
+
+    def __len__(self) -> int:
+        return self.count[0]
+
+    def remove(self, p: int) -> None:
+        if not self.alive[p]:
+            return
+        self.alive[p] = False
+        node = self.leaf_of[p]
+        count, parent = self.count, self.parent
+        while node >= 0:
+            count[node] -= 1
+            node = parent[node]
+
+    def restore(self, p: int) -> None:
+        if self.alive[p]:
+            return
+        self.alive[p] = True
+        node = self.leaf_of[p]
+        count, parent = self.count, self.parent
+        while node >= 0:
+            count[node] += 1
+            node = parent[node]
+
+    def _push_children(self, stack: List[int], node: int, x: float, y: float) -> None:
+        # far child first so the near one is searched next
+        q = x if self.dim[node] == 0 else y
+        if q < self.split[node]:
+            stack.append(self.right[node])
+            stack.append(self.left[node])
+        else:
+            stack.append(self.left[node])
+            stack.append(self.right[node])
+
+    def nearest(self, x: float, y: float) -> int:
+        # closest live point to (x, y), or -1 once every point is removed
+        xs, ys, alive, order = self.xs, self.ys, self.alive, self.order
+        box, count, left = self.box, self.count, self.left
+        best, best_p = math.inf, -1
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if count[node] == 0:
+                continue
+            x0, y0, x1, y1 = box[node]
+            dx = x0 - x if x < x0 else (x - x1 if x > x1 else 0.0)
+            dy = y0 - y if y < y0 else (y - y1 if y > y1 else 0.0)
+            if dx * dx + dy * dy >= best:
+                continue
+            if left[node] < 0:
+                for p in order[self.lo[node]:self.hi[node]]:
+                    if alive[p]:
+                        ex, ey = xs[p] - x, ys[p] - y
+                        dist = ex * ex + ey * ey
+                        if dist < best:
+                            best, best_p = dist, p
+            else:
+                self._push_children(stack, node, x, y)
+        return best_p
+
+    def nearest_to(self, p: int) -> int:
+        return self.nearest(self.xs[p], self.ys[p])
+
+    def _points_in_box(self, x0: float, y0: float, x1: float, y1: float) -> "np.ndarray":
+        # every point (live or not) of the leaves overlapping the box
+        box, left, right, lo, hi = self.box, self.left, self.right, self.lo, self.hi
+        slices = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            bx0, by0, bx1, by1 = box[node]
+            if bx0 > x1 or bx1 < x0 or by0 > y1 or by1 < y0:
+                continue
+            if left[node] < 0:
+                slices.append(self._order[lo[node]:hi[node]])
+            else:
+                stack.append(left[node])
+                stack.append(right[node])
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.intp)
+
+    def k_nearest_all(self, k: int) -> "np.ndarray":
+        # (n, k) array of each point's k nearest other points, nearest first.
+        # Done a leaf at a time: gather the points within r of the leaf's box,
+        # and double r until every member's k-th neighbour lies inside it.
+        n = len(self.xs)
+        k = min(k, n - 1)
+        out = np.empty((n, max(k, 0)), dtype=np.int64)
+        if k <= 0:
+            return out
+        X, Y = np.asarray(self.xs), np.asarray(self.ys)
+        rx0, ry0, rx1, ry1 = self.box[0]
+        area = max((rx1 - rx0) * (ry1 - ry0), 1e-12)
+        r0 = 1.5 * math.sqrt(area * (k + 1) / (math.pi * n))
+        for node, (lo, hi) in enumerate(zip(self.lo, self.hi)):
+            if self.left[node] >= 0 or hi == lo:
+                continue
+            members = self._order[lo:hi]
+            x0, y0, x1, y1 = self.box[node]
+            r = r0
+            while True:
+                cand = self._points_in_box(x0 - r, y0 - r, x1 + r, y1 + r)
+                if len(cand) > k:
+                    d2 = (X[members, None] - X[cand]) ** 2 + (Y[members, None] - Y[cand]) ** 2
+                    d2[members[:, None] == cand] = math.inf
+                    part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+                    kd = np.take_along_axis(d2, part, axis=1)
+                    if kd.max() <= r * r or len(cand) == n:
+                        rank = np.argsort(kd, axis=1, kind="stable")
+                        out[members] = cand[np.take_along_axis(part, rank, axis=1)]
+                        break
+                r *= 2.0
+        return out
+
+
 def route_distance(matrix: List[List[int]], route: List[int]) -> int:
     dist = 0
     for i in range(len(route) - 1):
@@ -27,124 +424,1604 @@ def route_distance(matrix: List[List[int]], route: List[int]) -> int:
     return dist
 
 
-def tsp_bruteforce(home: int, selected: List[int], matrix: List[List[int]]) -> Dict[str, Any]:
-    best_route = None
-    best_distance = float("inf")
+def _is_symmetric(d: List[List[int]]) -> bool:
+    m = len(d)
+    return all(d[i][j] == d[j][i] for i in range(m) for j in range(i + 1, m))
+
+
+def _exhaustive_search(
+    d: List[List[int]],
+    prefix: Tuple[int, ...] = (),
+    symmetric: bool = False,
+    shared=None,
+    deadline: Optional[float] = None,
+) -> Tuple[float, Optional[List[int]], bool]:
+    # Depth-first walk over every completion of `prefix` (local indices,
+    # home = 0, cities 1..k) in lexicographic order with running prefix sums.
+    # A branch is cut once its prefix can no longer beat the best tour, so
+    # the first optimum in lexicographic order is the one returned - the same
+    # tour permutations(selected) with a strict `<` would pick.
+    # With a symmetric matrix only tours whose first city is lower than the
+    # last are walked: each reversed duplicate is later in that order anyway.
+    # `shared` is an optional multiprocessing.Value holding a global bound.
+    # Past `deadline` (time.monotonic()) the walk stops with its best so far.
+    k = len(d) - 1
+    used = [False] * (k + 1)
+    used[0] = True
+    path = [0] * k
+    best_cost = float("inf")
+    best_path: Optional[List[int]] = None
+    limit = shared.value if shared is not None else float("inf")
+    ticks = 0
+    timed_out = False
+
+    def extend(depth: int, last: int, cost: int, first: int, above: int) -> None:
+        nonlocal best_cost, best_path, limit, ticks, timed_out
+        if depth == k:
+            total = cost + d[last][0]
+            if total < best_cost:
+                best_cost = total
+                best_path = path[:]
+                if shared is not None:
+                    with shared.get_lock():
+                        if total < shared.value:
+                            shared.value = total
+            return
+
+        ticks += 1
+        if ticks & 1023 == 0:
+            if shared is not None:
+                limit = shared.value
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out = True
+        if timed_out and best_path is not None:
+            return
+
+        row = d[last]
+        slots = k - depth - 1
+        for c in range(1, k + 1):
+            if used[c]:
+                continue
+            new_cost = cost + row[c]
+            if new_cost >= best_cost or new_cost > limit:
+                continue
+            f, a = first, above
+            if symmetric:
+                if depth == 0:
+                    f, a = c, k - c
+                elif c > first:
+                    a -= 1
+                if slots and not a:
+                    continue
+            used[c] = True
+            path[depth] = c
+            extend(depth + 1, c, new_cost, f, a)
+            used[c] = False
 
-    for perm in permutations(selected):
-        route = [home] + list(perm) + [home]
-        d = route_distance(matrix, route)
-        if d < best_distance:
-            best_distance = d
-            best_route = route
+    cost, last, first, above = 0, 0, 0, 0
+    for depth, c in enumerate(prefix):
+        used[c] = True
+        path[depth] = c
+        cost += d[last][c]
+        last = c
+    if prefix:
+        first = prefix[0]
+        above = sum(1 for c in range(first + 1, k + 1) if not used[c])
+        if symmetric and len(prefix) < k and not above:
+            return best_cost, None, False
 
-    return {"route": best_route, "distance": int(best_distance)}
+    extend(len(prefix), last, cost, first, above)
+    return best_cost, best_path, timed_out
+
+
+_worker_bound = None
+
+
+def _init_bruteforce_worker(shared) -> None:
+    global _worker_bound
+    _worker_bound = shared
+
+
+def _bruteforce_shard(
+    job: Tuple[List[List[int]], Tuple[int, ...], bool, Optional[float]]
+) -> Tuple[float, Optional[List[int]], bool]:
+    d, prefix, symmetric, deadline = job
+    return _exhaustive_search(d, prefix, symmetric, _worker_bound, deadline)
+
+
+# One long-lived worker pool for sharded brute force, started on first use
+# or by warm_bruteforce_pool (spawned, not forked, since the server process
+# is multi-threaded; spawned workers re-import the __main__ module). Its
+# shared bound belongs to one search at a time, so a search that finds the
+# pool busy runs serially instead of waiting.
+_bruteforce_processes = 1
+_bruteforce_pool = None
+_bruteforce_pool_size = 0
+_bruteforce_bound = None
+_bruteforce_lock = threading.Lock()
+
+
+def set_bruteforce_processes(processes: int) -> None:
+    # default `processes` for tsp_bruteforce, e.g. from config at startup
+    global _bruteforce_processes
+    _bruteforce_processes = max(1, int(processes))
+
+
+def _bruteforce_workers(processes: int):
+    # call with _bruteforce_lock held
+    global _bruteforce_pool, _bruteforce_pool_size, _bruteforce_bound
+    if _bruteforce_pool is None or _bruteforce_pool_size != processes:
+        if _bruteforce_pool is not None:
+            _bruteforce_pool.terminate()
+        ctx = multiprocessing.get_context("spawn")
+        _bruteforce_bound = ctx.Value("d", float("inf"))
+        _bruteforce_pool = ctx.Pool(processes, _init_bruteforce_worker, (_bruteforce_bound,))
+        _bruteforce_pool_size = processes
+    return _bruteforce_pool, _bruteforce_bound
+
+
+def warm_bruteforce_pool() -> None:
+    # Starts the pool for the configured process count and waits for its
+    # workers, so the first sharded search does not pay for spawning them.
+    processes = _bruteforce_processes
+    if processes <= 1:
+        return
+    with _bruteforce_lock:
+        pool, _ = _bruteforce_workers(processes)
+        pool.map(abs, range(processes), chunksize=1)
+
+
+def _bruteforce_parallel(
+    d: List[List[int]], processes: int, deadline: Optional[float] = None
+) -> Optional[Tuple[float, Optional[List[int]], bool]]:
+    # Shard by the first two cities. Shards are listed (and reduced) in
+    # lexicographic order, so ties resolve exactly as in a serial walk.
+    # Returns None when another search holds the pool.
+    if not _bruteforce_lock.acquire(blocking=False):
+        return None
+    try:
+        k = len(d) - 1
+        symmetric = _is_symmetric(d)
+        jobs = [
+            (d, (a, b), symmetric, deadline)
+            for a in range(1, k + 1)
+            for b in range(1, k + 1)
+            if a != b
+        ]
+        pool, shared = _bruteforce_workers(processes)
+        shared.value = float("inf")
+        shard_results = pool.map(_bruteforce_shard, jobs)
+    finally:
+        _bruteforce_lock.release()
+
+    best_cost, best_path = float("inf"), None
+    for cost, path, _ in shard_results:
+        if path is not None and cost < best_cost:
+            best_cost, best_path = cost, path
+    return best_cost, best_path, any(timed_out for _, _, timed_out in shard_results)
+
+
+def tsp_bruteforce(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    processes: Optional[int] = None,
+    min_parallel_k: int = 8,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    # processes=None uses the default set by set_bruteforce_processes (1
+    # unless configured); k >= min_parallel_k is then sharded over the pool
+    nodes, d = _local_distances(home, selected, matrix)
+    if processes is None:
+        processes = _bruteforce_processes
+
+    found = None
+    if processes > 1 and len(selected) >= min_parallel_k:
+        found = _bruteforce_parallel(d, processes, deadline)
+    if found is None:
+        found = _exhaustive_search(d, (), _is_symmetric(d), deadline=deadline)
+    best_distance, best_path, timed_out = found
+
+    route = [home] + [nodes[c] for c in best_path] + [home]
+    return {"route": route, "distance": int(best_distance), "timedOut": timed_out}
+
+
+def tsp_held_karp(home: int, selected: List[int], matrix: List[List[int]]) -> Dict[str, Any]:
+    # Exact dynamic programme over subsets, O(2^k * k^2) time and O(2^k * k)
+    # memory, evaluated one popcount layer at a time with NumPy. Practical
+    # up to k ~ 20, where brute force is long out of reach.
+    nodes, d = _local_distances(home, selected, matrix)
+    k = len(selected)
+    if k <= 2:
+        route = nodes + [home]
+        return {"route": route, "distance": int(route_distance(matrix, route))}
+
+    dist = np.asarray(d, dtype=np.int64)
+    inner = dist[1:, 1:]
+    full = (1 << k) - 1
+    inf = np.iinfo(np.int64).max // 4
+
+    dp = np.full((1 << k, k), inf, dtype=np.int64)
+    parent = np.full((1 << k, k), -1, dtype=np.int8)
+    for j in range(k):
+        dp[1 << j, j] = dist[0, j + 1]
+
+    masks = np.arange(1 << k)
+    popcount = np.zeros(1 << k, dtype=np.int8)
+    for b in range(k):
+        popcount += ((masks >> b) & 1).astype(np.int8)
+
+    for size in range(2, k + 1):
+        layer = masks[popcount == size]
+        for j in range(k):
+            sub = layer[(layer >> j) & 1 == 1]
+            prev = sub ^ (1 << j)
+            cost = dp[prev] + inner[:, j]
+            best = np.argmin(cost, axis=1)
+            dp[sub, j] = cost[np.arange(len(sub)), best]
+            parent[sub, j] = best
+
+    closing = dp[full] + dist[1:, 0]
+    last = int(np.argmin(closing))
+    distance = int(closing[last])
+
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        prev_last = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev_last
+    order.reverse()
+
+    route = [home] + [nodes[c] for c in order] + [home]
+    return {"route": route, "distance": distance}
 
 
 def tsp_nearest_neighbor(home: int, selected: List[int], matrix: List[List[int]]) -> Dict[str, Any]:
-    unvisited = set(selected)
-    route = [home]
-    current = home
+    if isinstance(matrix, EuclideanInstance):
+        return _nearest_neighbor_spatial(home, selected, matrix)
 
-    while unvisited:
-        next_city = min(unvisited, key=lambda c: matrix[current][c])
-        unvisited.remove(next_city)
-        route.append(next_city)
-        current = next_city
+    # each step takes the first unvisited city on the current city's
+    # candidate list and only scans every city once that list is used up
+    nodes, d = _local_distances(home, selected, matrix)
+    tour = _nearest_neighbour_tour(d, _local_candidates(nodes, matrix, d, 10))
+    route = [nodes[c] for c in tour] + [home]
+    return {"route": route, "distance": int(route_distance(matrix, route))}
 
-    route.append(home)
-    d = route_distance(matrix, route)
-    return {"route": route, "distance": int(d)}
+
+def _nearest_neighbor_spatial(home: int, selected: List[int], matrix: "EuclideanInstance") -> Dict[str, Any]:
+    # same tour construction, but each step asks the k-d tree for the nearest
+    # unvisited city instead of scanning all of them
+    nodes = [home] + list(selected)
+    tree = matrix.tree(nodes)
+    tree.remove(0)
+    tour = [0]
+    current = 0
+    for _ in range(len(nodes) - 1):
+        current = tree.nearest_to(current)
+        tree.remove(current)
+        tour.append(current)
+    route = [nodes[c] for c in tour] + [home]
+    return {"route": route, "distance": int(route_distance(matrix, route))}
+
+
+class _ScanIndex:
+    # linear-scan stand-in for _KDTree.nearest_to/remove/restore over a dense table
+
+    def __init__(self, d: List[List[int]]):
+        self.d = d
+        self.alive = set(range(len(d)))
+
+    def remove(self, p: int) -> None:
+        self.alive.discard(p)
+
+    def restore(self, p: int) -> None:
+        self.alive.add(p)
+
+    def nearest_to(self, p: int) -> int:
+        row = self.d[p]
+        return min(self.alive, key=row.__getitem__) if self.alive else -1
+
+
+def _greedy_tour(m: int, pairs: "np.ndarray", weights: "np.ndarray", index, weight) -> List[int]:
+    # Greedy edge matching: take candidate edges shortest first while both
+    # ends have degree < 2 and no cycle closes. The paths left over are then
+    # merged the same way in rounds, each free end proposing an edge to its
+    # nearest free end on another path (found through `index`, which holds
+    # exactly the free ends), until one Hamiltonian path remains.
+    parent = list(range(m))
+
+    def find(a: int) -> int:
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    degree = [0] * m
+    adj: List[List[int]] = [[] for _ in range(m)]
+    for e in np.argsort(weights, kind="stable").tolist():
+        i, j = int(pairs[e, 0]), int(pairs[e, 1])
+        if degree[i] < 2 and degree[j] < 2:
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[ri] = rj
+                degree[i] += 1
+                degree[j] += 1
+                adj[i].append(j)
+                adj[j].append(i)
+
+    other_end = list(range(m))
+    for s in range(m):
+        if degree[s] == 2:
+            index.remove(s)
+        elif degree[s] == 1 and other_end[s] == s:
+            prev, cur = -1, s
+            while True:
+                nxt = [c for c in adj[cur] if c != prev]
+                if not nxt:
+                    break
+                prev, cur = cur, nxt[0]
+            other_end[s], other_end[cur] = cur, s
+    ends = [s for s in range(m) if degree[s] < 2]
+
+    while len(ends) > 2 or (len(ends) == 2 and other_end[ends[0]] != ends[1]):
+        proposals = []
+        for e in ends:
+            o = other_end[e]
+            index.remove(e)
+            index.remove(o)
+            f = index.nearest_to(e)
+            index.restore(e)
+            index.restore(o)
+            proposals.append((weight(e, f), min(e, f), max(e, f)))
+        proposals.sort()
+        for _, e, f in proposals:
+            if degree[e] < 2 and degree[f] < 2 and other_end[e] != f:
+                a, b = other_end[e], other_end[f]
+                other_end[a], other_end[b] = b, a
+                for c in (e, f):
+                    degree[c] += 1
+                    if degree[c] == 2:
+                        index.remove(c)
+                adj[e].append(f)
+                adj[f].append(e)
+        ends = [e for e in ends if degree[e] < 2]
+
+    tour, prev, cur = [ends[0]], -1, ends[0]
+    while len(tour) < m:
+        nxt = adj[cur][0] if adj[cur][0] != prev else adj[cur][1]
+        prev, cur = cur, nxt
+        tour.append(cur)
+    i = tour.index(0)
+    return tour[i:] + tour[:i]
+
+
+def tsp_greedy_edge(
+    home: int, selected: List[int], matrix: List[List[int]], neighbours_k: int = 10
+) -> Dict[str, Any]:
+    # Candidate edges are each city's neighbours_k nearest cities. On a
+    # EuclideanInstance those come from a k-d tree and no distance table is
+    # built, so the whole construction is about O(k log k).
+    nodes = [home] + list(selected)
+    m = len(nodes)
+    if m <= 3:
+        route = nodes + [home]
+        return {"route": route, "distance": int(route_distance(matrix, route))}
+    k = min(neighbours_k, m - 1)
+
+    if isinstance(matrix, EuclideanInstance):
+        index = matrix.tree(nodes)
+        neighbours = _local_candidates(nodes, matrix, None, k)
+
+        def weight(i: int, j: int) -> int:
+            return matrix.d(nodes[i], nodes[j])
+
+    else:
+        nodes, d = _local_distances(home, selected, matrix)
+        index = _ScanIndex(d)
+        neighbours = _local_candidates(nodes, matrix, d, k)
+
+        def weight(i: int, j: int) -> int:
+            return d[i][j]
+
+    a = np.repeat(np.arange(m), k)
+    b = np.asarray(neighbours, dtype=np.int64).ravel()
+    codes = np.unique(np.minimum(a, b) * m + np.maximum(a, b))
+    pairs = np.stack([codes // m, codes % m], axis=1)
+    if isinstance(matrix, EuclideanInstance):
+        pts = matrix.xy[np.asarray(nodes, dtype=np.intp)]
+        weights = matrix.lengths(pts[pairs[:, 0]] - pts[pairs[:, 1]])
+    else:
+        weights = np.asarray([d[i][j] for i, j in pairs.tolist()])
+
+    tour = _greedy_tour(m, pairs, weights, index, weight)
+    route = [nodes[c] for c in tour] + [home]
+    return {"route": route, "distance": int(route_distance(matrix, route))}
+
+
+def _tour_lengths(dist: "np.ndarray", tours: "np.ndarray") -> "np.ndarray":
+    # lengths of closed tours 0 -> tours[r] -> 0 for every row r, in one pass
+    if tours.shape[1] == 0:
+        return np.zeros(len(tours), dtype=dist.dtype)
+    return (
+        dist[0, tours[:, 0]]
+        + dist[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+        + dist[tours[:, -1], 0]
+    )
+
+
+def _permutation_batches(
+    k: int,
+    batch_size: int,
+    exhaustive: bool,
+    rng: "np.random.Generator",
+) -> Iterator["np.ndarray"]:
+    # yields (batch, k) arrays of local city indices 1..k; nothing is kept
+    # once the caller moves on to the next batch
+    cities = np.arange(1, k + 1)
+    if exhaustive:
+        perms = permutations(range(1, k + 1))
+        while True:
+            chunk = list(islice(perms, batch_size))
+            if not chunk:
+                return
+            yield np.array(chunk, dtype=np.intp).reshape(len(chunk), k)
+    else:
+        while True:
+            yield rng.permuted(np.broadcast_to(cities, (batch_size, k)), axis=1)
 
 
 def tsp_random_search(
     home: int,
     selected: List[int],
     matrix: List[List[int]],
-    iterations: int = 2000,
+    iterations: Optional[int] = 2000,
+    batch_size: int = 256,
+    time_budget_ms: Optional[float] = None,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
 ) -> Dict[str, Any]:
+    # Small instances (k <= 7) stream every permutation; larger ones sample
+    # until `iterations` tours have been scored or `time_budget_ms` runs out.
+    # An external `deadline` (time.monotonic()) cuts either mode short.
+    # "convergence" records (samples, best distance) at every improvement.
     k = len(selected)
+    nodes, d = _local_distances(home, selected, matrix)
+    dist = np.asarray(d)
+    rng = np.random.default_rng(seed)
+    exhaustive = k <= 7
 
-    if k <= 7:
-        iters = list(permutations(selected))
-    else:
-        iters = []
-        for _ in range(iterations):
-            perm = random.sample(selected, k)
-            iters.append(perm)
+    if not exhaustive and iterations is None and time_budget_ms is None:
+        raise ValueError("random search needs an iteration count or a time budget")
 
-    best_route = None
+    budget_end = None
+    if time_budget_ms is not None:
+        budget_end = time.monotonic() + time_budget_ms / 1000.0
+    timed_out = False
+
+    best_perm = None
     best_distance = float("inf")
-    for perm in iters:
-        route = [home] + list(perm) + [home]
-        d = route_distance(matrix, route)
-        if d < best_distance:
-            best_distance = d
-            best_route = route
+    samples = 0
+    convergence: List[Dict[str, int]] = []
+
+    for batch in _permutation_batches(k, batch_size, exhaustive, rng):
+        if not exhaustive and iterations is not None:
+            batch = batch[: iterations - samples]
+        lengths = _tour_lengths(dist, batch)
+
+        i = int(np.argmin(lengths))
+        if lengths[i] < best_distance:
+            best_distance = lengths[i]
+            best_perm = batch[i].tolist()
+            convergence.append({"samples": samples + i + 1, "distance": int(best_distance)})
+        samples += len(batch)
+
+        if not exhaustive and iterations is not None and samples >= iterations:
+            break
+        if deadline is not None or budget_end is not None:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                timed_out = True
+                break
+            if budget_end is not None and now >= budget_end:
+                break
+
+    route = [home] + [nodes[c] for c in best_perm] + [home]
+    return {
+        "route": route,
+        "distance": int(best_distance),
+        "samples": samples,
+        "convergence": convergence,
+        "timedOut": timed_out,
+    }
+
+def tsp_simulated_annealing(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    iterations: int = 20000,
+    cooling: Optional[float] = None,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Random 2-opt moves scored by their O(1) delta; worse moves are taken
+    # with probability exp(-delta / T) while T cools geometrically from the
+    # mean uphill delta to ~0.1% of it over `iterations` steps.
+    nodes, d = _local_distances(home, selected, matrix)
+    m = len(nodes)
+    rng = random.Random(seed)
+    tour = list(range(m))
+    length = sum(d[tour[i - 1]][tour[i]] for i in range(m))
+
+    if m < 4:
+        route = [nodes[c] for c in tour] + [home]
+        return {"route": route, "distance": int(length), "convergence": [], "timedOut": False}
+
+    def random_move() -> Tuple[int, int, int]:
+        i = rng.randrange(1, m - 1)
+        j = rng.randrange(i + 1, m)
+        a, b = tour[i - 1], tour[i]
+        c, e = tour[j], tour[(j + 1) % m]
+        return i, j, d[a][c] + d[b][e] - d[a][b] - d[c][e]
+
+    uphill = [delta for _, _, delta in (random_move() for _ in range(100)) if delta > 0]
+    temperature = sum(uphill) / len(uphill) if uphill else 1.0
+    if cooling is None:
+        cooling = 0.001 ** (1.0 / iterations)
+
+    best_tour, best_length = tour[:], length
+    convergence = [{"iteration": 0, "distance": int(length)}]
+    timed_out = False
+
+    for it in range(1, iterations + 1):
+        if deadline is not None and it & 1023 == 0 and time.monotonic() >= deadline:
+            timed_out = True
+            break
+        i, j, delta = random_move()
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            tour[i:j + 1] = tour[i:j + 1][::-1]
+            length += delta
+            if length < best_length:
+                best_tour, best_length = tour[:], length
+                convergence.append({"iteration": it, "distance": int(length)})
+        temperature *= cooling
+
+    route = [nodes[c] for c in best_tour] + [home]
+    return {
+        "route": route,
+        "distance": int(best_length),
+        "convergence": convergence,
+        "timedOut": timed_out,
+    }
+
+
+def _order_crossover(p1: "np.ndarray", p2: "np.ndarray", i: int, j: int) -> "np.ndarray":
+    # OX: keep p1[i:j], fill the remaining slots with p2's cities in p2 order
+    child = np.empty_like(p1)
+    child[i:j] = p1[i:j]
+    kept = set(p1[i:j].tolist())
+    fill = [c for c in p2.tolist() if c not in kept]
+    child[:i] = fill[:i]
+    child[j:] = fill[i:]
+    return child
+
+
+def tsp_genetic(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    population: int = 60,
+    generations: int = 100,
+    mutation_rate: float = 0.2,
+    elite: int = 2,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Tournament selection, order crossover and inversion mutation; each
+    # generation's whole population is scored with one _tour_lengths call.
+    k = len(selected)
+    nodes, d = _local_distances(home, selected, matrix)
+    dist = np.asarray(d)
+    rng = np.random.default_rng(seed)
+
+    cities = np.arange(1, k + 1)
+    pop = rng.permuted(np.broadcast_to(cities, (population, k)), axis=1)
+    fitness = _tour_lengths(dist, pop)
+    convergence = [{"generation": 0, "distance": int(fitness.min())}]
+    timed_out = False
+
+    for gen in range(1, generations + 1):
+        if k < 3:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            timed_out = True
+            break
 
-    return {"route": best_route, "distance": int(best_distance)}
+        order = np.argsort(fitness, kind="stable")
+        children = [pop[idx] for idx in order[:elite]]
+
+        # binary tournaments for every parent slot at once
+        contenders = rng.integers(0, population, size=(2, 2 * (population - elite)))
+        winners = np.where(
+            fitness[contenders[0]] <= fitness[contenders[1]], contenders[0], contenders[1]
+        )
+        cuts = np.sort(rng.integers(0, k + 1, size=(population - elite, 2)), axis=1)
+        mutate = rng.random(population - elite) < mutation_rate
+        flips = np.sort(rng.integers(0, k, size=(population - elite, 2)), axis=1)
+
+        for c in range(population - elite):
+            child = _order_crossover(
+                pop[winners[2 * c]], pop[winners[2 * c + 1]], cuts[c, 0], cuts[c, 1]
+            )
+            if mutate[c]:
+                a, b = flips[c]
+                child[a:b + 1] = child[a:b + 1][::-1].copy()
+            children.append(child)
+
+        pop = np.array(children)
+        fitness = _tour_lengths(dist, pop)
+        best = int(fitness.min())
+        if best < convergence[-1]["distance"]:
+            convergence.append({"generation": gen, "distance": best})
+
+    winner = pop[int(np.argmin(fitness))].tolist()
+    route = [home] + [nodes[c] for c in winner] + [home]
+    return {
+        "route": route,
+        "distance": int(route_distance(matrix, route)),
+        "convergence": convergence,
+        "timedOut": timed_out,
+    }
 
+def tsp_ant_colony(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    ants: int = 20,
+    iterations: int = 50,
+    alpha: float = 1.0,
+    beta: float = 3.0,
+    rho: float = 0.1,
+    neighbours_k: int = 15,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Ant System with all ants built in lock-step: each step draws the next
+    # city for every ant by one vectorised roulette over its candidate list
+    # (falling back to all unvisited cities once those are used up).
+    # Evaporation and deposit are single array updates of the pheromone matrix.
+    nodes, d = _local_distances(home, selected, matrix)
+    m = len(nodes)
+    dist = np.asarray(d, dtype=float)
+    rng = np.random.default_rng(seed)
 
-def tsp_mst_prim(home: int, selected: List[int], matrix: List[List[int]]) -> Dict[str, Any]:
-    subset = set(selected)
-    subset.add(home)
+    if m < 4:
+        route = nodes + [home]
+        return {"route": route, "distance": int(route_distance(matrix, route)),
+                "convergence": [], "timedOut": False}
 
-    visited = {home}
-    edges_mst = [] 
+    neighbours = _local_candidates(nodes, matrix, d, neighbours_k)
+    candidates = np.asarray(neighbours, dtype=np.intp)
+    c = candidates.shape[1]
+    masked = dist + np.diag(np.full(m, np.inf))
+    with np.errstate(divide="ignore"):
+        eta = np.where(masked > 0, 1.0 / masked, 1e6)
 
-    while visited != subset:
-        best_edge = None
-        best_weight = float("inf")
+    nn_len = float(_tour_lengths(dist, np.array([_nearest_neighbour_tour(d, neighbours)[1:]]))[0])
+    tau = np.full((m, m), 1.0 / (m * max(nn_len, 1.0)))
 
-        for u in visited:
-            for v in subset - visited:
-                w = matrix[u][v]
-                if w < best_weight:
-                    best_weight = w
-                    best_edge = (u, v)
+    rows = np.arange(ants)
+    best_tour, best_len = None, np.inf
+    convergence = []
+    timed_out = False
 
-        if best_edge is None:
+    for it in range(1, iterations + 1):
+        if deadline is not None and time.monotonic() >= deadline:
+            timed_out = True
             break
 
-        u, v = best_edge
-        edges_mst.append((u, v))
-        visited.add(v)
+        attraction = tau ** alpha * eta ** beta
+        cand_attraction = np.take_along_axis(attraction, candidates, axis=1)
+
+        tours = np.zeros((ants, m), dtype=np.intp)
+        visited = np.zeros((ants, m), dtype=bool)
+        visited[:, 0] = True
+        current = np.zeros(ants, dtype=np.intp)
 
-    adj: Dict[int, List[int]] = {}
-    for u, v in edges_mst:
-        adj.setdefault(u, []).append(v)
-        adj.setdefault(v, []).append(u)
+        for step in range(1, m):
+            cand = candidates[current]
+            weights = np.where(visited[rows[:, None], cand], 0.0, cand_attraction[current])
+            totals = weights.sum(axis=1)
+            draws = rng.random(ants) * totals
+            pick = (np.cumsum(weights, axis=1) < draws[:, None]).sum(axis=1)
+            nxt = cand[rows, np.minimum(pick, c - 1)]
 
-    route_order: List[int] = []
+            stuck = (totals <= 0) | visited[rows, nxt]
+            if stuck.any():
+                full = np.where(visited[stuck], 0.0, attraction[current[stuck]])
+                full_totals = full.sum(axis=1)
+                full_draws = rng.random(int(stuck.sum())) * full_totals
+                full_pick = (np.cumsum(full, axis=1) < full_draws[:, None]).sum(axis=1)
+                nxt[stuck] = np.minimum(full_pick, m - 1)
+                # guard against float round-off landing on a visited city
+                still = visited[stuck, nxt[stuck]]
+                if still.any():
+                    idx = np.flatnonzero(stuck)[still]
+                    nxt[idx] = np.argmin(visited[idx], axis=1)
+
+            tours[:, step] = nxt
+            visited[rows, nxt] = True
+            current = nxt
+
+        lengths = _tour_lengths(dist, tours[:, 1:])
+        i = int(np.argmin(lengths))
+        if lengths[i] < best_len:
+            best_len, best_tour = float(lengths[i]), tours[i].copy()
+        convergence.append({"iteration": it, "distance": int(lengths[i])})
+
+        tau *= 1.0 - rho
+        src = tours.ravel()
+        dst = np.roll(tours, -1, axis=1).ravel()
+        deposit = np.repeat(1.0 / lengths, m)
+        np.add.at(tau, (src, dst), deposit)
+        np.add.at(tau, (dst, src), deposit)
+
+    if best_tour is None:
+        best_tour = np.array(_nearest_neighbour_tour(d, neighbours))
+    route = [nodes[c] for c in best_tour.tolist()] + [home]
+    return {
+        "route": route,
+        "distance": int(route_distance(matrix, route)),
+        "convergence": convergence,
+        "timedOut": timed_out,
+    }
 
-    def dfs(node: int, parent: int = -1):
-        route_order.append(node)
-        for nxt in adj.get(node, []):
-            if nxt != parent:
-                dfs(nxt, node)
 
-    dfs(home)
+def _prim_mst(d: List[List[int]]) -> Tuple[List[int], List[int]]:
+    # dense Prim with key/parent arrays: O(m^2) time, O(m) extra memory
+    m = len(d)
+    inf = float("inf")
+    key = list(d[0])
+    parent = [0] * m
+    parent[0] = -1
+    remaining = list(range(1, m))
+    order = [0]
+
+    while remaining:
+        best_i = 0
+        best_key = inf
+        for i, v in enumerate(remaining):
+            if key[v] < best_key:
+                best_key = key[v]
+                best_i = i
+        u = remaining[best_i]
+        remaining[best_i] = remaining[-1]
+        remaining.pop()
+        order.append(u)
+
+        row = d[u]
+        for v in remaining:
+            w = row[v]
+            if w < key[v]:
+                key[v] = w
+                parent[v] = u
+
+    return parent, order
+
+
+def _prim_mst_heap(d: List[List[int]], neighbours: List[List[int]]) -> Tuple[List[int], List[int]]:
+    # lazy-heap Prim over the (symmetrised) candidate graph: O(m * c * log m).
+    # If the candidate graph is disconnected, the tree is bridged by the
+    # cheapest edge from the last tree vertex to an unreached one.
+    m = len(d)
+    adj = [set(n) for n in neighbours]
+    for u in range(m):
+        for v in neighbours[u]:
+            adj[v].add(u)
+
+    in_tree = [False] * m
+    parent = [-1] * m
+    order: List[int] = []
+    heap = [(0, 0, -1)]
+
+    while len(order) < m:
+        if not heap:
+            last = order[-1]
+            row = d[last]
+            v = min((c for c in range(m) if not in_tree[c]), key=row.__getitem__)
+            heap.append((row[v], v, last))
+        w, u, p = heapq.heappop(heap)
+        if in_tree[u]:
+            continue
+        in_tree[u] = True
+        parent[u] = p
+        order.append(u)
+        row = d[u]
+        for v in adj[u]:
+            if not in_tree[v]:
+                heapq.heappush(heap, (row[v], v, u))
+
+    return parent, order
+
+
+def _preorder(parent: List[int], order: List[int], root: int = 0) -> List[int]:
+    # iterative DFS preorder; children are visited in the order they joined the tree
+    children: List[List[int]] = [[] for _ in parent]
+    for v in order:
+        if parent[v] >= 0:
+            children[parent[v]].append(v)
+
+    walk: List[int] = []
+    stack = [root]
+    while stack:
+        u = stack.pop()
+        walk.append(u)
+        stack.extend(reversed(children[u]))
+    return walk
+
+
+def tsp_mst_prim(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    use_heap: bool = False,
+    neighbours_k: int = 10,
+) -> Dict[str, Any]:
+    nodes, d = _local_distances(home, selected, matrix)
+
+    if use_heap:
+        parent, order = _prim_mst_heap(d, _local_candidates(nodes, matrix, d, neighbours_k))
+    else:
+        parent, order = _prim_mst(d)
 
-    route = route_order + [home]
+    route = [nodes[c] for c in _preorder(parent, order)] + [home]
     d = route_distance(matrix, route)
     return {"route": route, "distance": int(d)}
 
 
-def run_algorithms(home: int, selected: List[int], matrix: List[List[int]]) -> Dict[str, Dict[str, Any]]:
+def _prim_mst_dense(w: "np.ndarray") -> "np.ndarray":
+    # the same dense Prim as _prim_mst, with each key update one vectorised
+    # step: O(m^2) work but only m Python-level iterations
+    m = len(w)
+    parent = np.zeros(m, dtype=np.intp)
+    if m < 2:
+        parent[:] = -1
+        return parent
+    in_tree = np.zeros(m, dtype=bool)
+    in_tree[0] = True
+    key = w[0].astype(np.float64)
+    key[0] = np.inf
+    parent[0] = -1
+    for _ in range(m - 1):
+        u = int(np.argmin(key))
+        in_tree[u] = True
+        key[u] = np.inf
+        row = w[u]
+        better = (row < key) & ~in_tree
+        key[better] = row[better]
+        parent[better] = u
+    return parent
 
-    algorithms = {
-        "bruteforce": tsp_bruteforce,    
-        "nearest_neighbor": tsp_nearest_neighbor, 
-        "mst_prim": tsp_mst_prim,
-        "random_search": tsp_random_search, 
-    }
 
+def _one_tree(w: "np.ndarray") -> Tuple[float, "np.ndarray"]:
+    # minimum 1-tree: a spanning tree on vertices 1..m-1 plus the two
+    # cheapest edges at vertex 0; returns its cost and vertex degrees
+    m = len(w)
+    degree = np.zeros(m, dtype=np.int64)
+    parent = _prim_mst_dense(w[1:, 1:])
+    child = np.arange(1, m - 1)
+    cost = float(w[1:, 1:][child, parent[1:]].sum())
+    np.add.at(degree, child + 1, 1)
+    np.add.at(degree, parent[1:] + 1, 1)
+    two = np.argpartition(w[0, 1:], 1)[:2] + 1
+    cost += float(w[0, two].sum())
+    degree[0] = 2
+    degree[two] += 1
+    return cost, degree
+
+
+def held_karp_lower_bound(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    iterations: int = 200,
+    upper: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Held-Karp bound: maximise L(pi) = min 1-tree(d_ij + pi_i + pi_j) - 2 sum(pi)
+    # by subgradient ascent (g = degree - 2, Polyak step towards `upper`,
+    # a nearest-neighbour tour length if not given). Every L(pi) is a lower
+    # bound on the optimal tour, so "bound" is guaranteed whenever the loop
+    # stops; "optimal" means the 1-tree was itself a tour. O(m^2) per step.
+    nodes, d = _local_distances(home, selected, matrix)
+    m = len(nodes)
+    if m <= 3:
+        bound = route_distance(d, list(range(m)) + [0])
+        return {"bound": bound, "iterations": 0, "optimal": True, "timedOut": False}
+
+    w = np.asarray(d, dtype=np.float64)
+    if upper is None:
+        tour = _nearest_neighbour_tour(d, _local_candidates(nodes, matrix, d, 10))
+        upper = route_distance(d, tour + [0])
+
+    pi = np.zeros(m)
+    best = -np.inf
+    step_scale = 2.0
+    stale = 0
+    optimal = False
+    timed_out = False
+    done = 0
+    for done in range(1, iterations + 1):
+        if deadline is not None and time.monotonic() >= deadline:
+            timed_out = True
+            break
+        cost, degree = _one_tree(w + pi[:, None] + pi[None, :])
+        value = cost - 2.0 * pi.sum()
+        if value > best + 1e-9:
+            best, stale = value, 0
+        else:
+            stale += 1
+            if stale >= 10:
+                step_scale, stale = step_scale / 2.0, 0
+        g = degree - 2
+        norm = float(g @ g)
+        if norm == 0:
+            optimal = True
+            break
+        pi += step_scale * max(upper - value, 1.0) / norm * g
+
+    # tour lengths are integers, so the bound can be rounded up
+    bound = int(math.ceil(best - 1e-6)) if best > -np.inf else 0
+    return {"bound": bound, "iterations": done, "optimal": optimal, "timedOut": timed_out}
+
+
+def lower_bound_or_none(result: Dict[str, Any]) -> Optional[int]:
+    # the "bound" of a held_karp_lower_bound result, or None when the
+    # deadline cut it short or no step ran, so a gap of 0 is never claimed
+    if result["timedOut"] or result["bound"] <= 0:
+        return None
+    return result["bound"]
+
+
+def gap_pct(distance: int, bound: Optional[int]) -> Optional[float]:
+    # how far above the lower bound a tour is, in percent; None without a bound
+    if bound is None:
+        return None
+    return 100.0 * (distance - bound) / bound
+
+
+def _min_weight_matching_exact(d: List[List[int]], vertices: List[int]) -> List[Tuple[int, int]]:
+    # exact minimum-weight perfect matching by DP over subsets: the lowest
+    # unmatched vertex is always paired first, so each state is a bitmask
+    t = len(vertices)
+
+    @functools.lru_cache(maxsize=None)
+    def solve(mask: int) -> Tuple[float, Tuple[Tuple[int, int], ...]]:
+        if mask == 0:
+            return 0, ()
+        i = (mask & -mask).bit_length() - 1
+        rest = mask & ~(1 << i)
+        row = d[vertices[i]]
+        best: Tuple[float, Tuple[Tuple[int, int], ...]] = (float("inf"), ())
+        j_mask = rest
+        while j_mask:
+            low = j_mask & -j_mask
+            j = low.bit_length() - 1
+            j_mask ^= low
+            cost, pairs = solve(rest & ~low)
+            cost += row[vertices[j]]
+            if cost < best[0]:
+                best = (cost, pairs + ((vertices[i], vertices[j]),))
+        return best
+
+    return list(solve((1 << t) - 1)[1])
+
+
+def _min_weight_matching_greedy(d: List[List[int]], vertices: List[int]) -> List[Tuple[int, int]]:
+    edges = sorted(
+        (d[u][v], u, v) for a, u in enumerate(vertices) for v in vertices[a + 1:]
+    )
+    matched = set()
+    pairs = []
+    for _, u, v in edges:
+        if u not in matched and v not in matched:
+            matched.update((u, v))
+            pairs.append((u, v))
+    return pairs
+
+
+def _euler_circuit(m: int, edges: List[Tuple[int, int]], start: int = 0) -> List[int]:
+    # Hierholzer's algorithm on a multigraph given as an edge list
+    adj: List[List[Tuple[int, int]]] = [[] for _ in range(m)]
+    for idx, (u, v) in enumerate(edges):
+        adj[u].append((v, idx))
+        adj[v].append((u, idx))
+
+    used = [False] * len(edges)
+    ptr = [0] * m
+    stack = [start]
+    circuit: List[int] = []
+    while stack:
+        u = stack[-1]
+        while ptr[u] < len(adj[u]) and used[adj[u][ptr[u]][1]]:
+            ptr[u] += 1
+        if ptr[u] == len(adj[u]):
+            circuit.append(stack.pop())
+        else:
+            v, idx = adj[u][ptr[u]]
+            used[idx] = True
+            stack.append(v)
+    circuit.reverse()
+    return circuit
+
+
+def tsp_christofides(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    exact_limit: int = 20,
+    use_heap: bool = False,
+    neighbours_k: int = 10,
+) -> Dict[str, Any]:
+    # 1.5-approximation on metric instances (generate_random_matrix draws every
+    # edge from [low, high] with high <= 2 * low, so the triangle inequality
+    # holds). The bound is only guaranteed while the matching is exact.
+    nodes, d = _local_distances(home, selected, matrix)
+    m = len(nodes)
+
+    if use_heap:
+        parent, order = _prim_mst_heap(d, _local_candidates(nodes, matrix, d, neighbours_k))
+    else:
+        parent, order = _prim_mst(d)
+
+    edges = [(parent[v], v) for v in order if parent[v] >= 0]
+    degree = [0] * m
+    for u, v in edges:
+        degree[u] += 1
+        degree[v] += 1
+    odd = [v for v in range(m) if degree[v] % 2 == 1]
+
+    if len(odd) <= exact_limit:
+        edges += _min_weight_matching_exact(d, odd)
+    else:
+        edges += _min_weight_matching_greedy(d, odd)
+
+    seen = [False] * m
+    tour: List[int] = []
+    for v in _euler_circuit(m, edges, 0):
+        if not seen[v]:
+            seen[v] = True
+            tour.append(v)
+
+    route = [nodes[c] for c in tour] + [home]
+    return {"route": route, "distance": int(route_distance(matrix, route))}
+
+
+def _local_distances(home: int, selected: List[int], matrix: List[List[int]]):
+    nodes = [home] + list(selected)
+    if isinstance(matrix, (CondensedMatrix, EuclideanInstance)):
+        return nodes, matrix.submatrix(nodes)
+    rows = [matrix[c] for c in nodes]
+    d = [[row[c] for c in nodes] for row in rows]
+    return nodes, d
+
+
+class _LocalMetric:
+    # Distances between local indices (positions in `nodes`) without an
+    # m x m table when the instance is a CondensedMatrix or EuclideanInstance:
+    # d(i, j) reads the condensed buffer or the coordinates, rows(block)
+    # returns a block of rows as a NumPy array. Plain list matrices are
+    # copied into a local table as _local_distances does.
+
+    def __init__(self, nodes: List[int], matrix):
+        self.m = len(nodes)
+        self.points: Optional[EuclideanInstance] = None
+        self.table: Optional[List[List[int]]] = None
+        idx = np.asarray(nodes, dtype=np.intp)
+        if isinstance(matrix, EuclideanInstance):
+            self.points = EuclideanInstance(matrix.xy[idx], matrix.metric)
+            self.d = self.points.d
+        elif isinstance(matrix, CondensedMatrix):
+            self.matrix, self.idx = matrix, idx
+            n, data, g = matrix.n, matrix.data, idx.tolist()
+
+            def d(i: int, j: int) -> int:
+                a, b = g[i], g[j]
+                if a == b:
+                    return 0
+                if a > b:
+                    a, b = b, a
+                return int(data[n * a - a * (a + 1) // 2 + (b - a - 1)])
+
+            self.d = d
+        else:
+            table = _local_distances(nodes[0], nodes[1:], matrix)[1]
+            self.table = table
+            self.d = lambda i, j: table[i][j]
+
+    def rows(self, block: "np.ndarray") -> "np.ndarray":
+        if self.points is not None:
+            xy = self.points.xy
+            return self.points.lengths(xy[block][:, None, :] - xy[None, :, :])
+        if self.table is not None:
+            return np.asarray([self.table[r] for r in block.tolist()], dtype=np.int64)
+        n, g = self.matrix.n, self.idx
+        i, j = np.minimum.outer(g[block], g), np.maximum.outer(g[block], g)
+        same = i == j
+        out = self.matrix.data[np.where(same, 0, n * i - i * (i + 1) // 2 + (j - i - 1))].astype(np.int64)
+        out[same] = 0
+        return out
+
+    def row(self, i: int) -> "np.ndarray":
+        return self.rows(np.array([i]))[0]
+
+    def neighbours(self, k: int) -> List[List[int]]:
+        # k nearest of every local index, a block of rows at a time
+        m = self.m
+        k = min(k, m - 1)
+        if k <= 0:
+            return [[] for _ in range(m)]
+        out = np.empty((m, k), dtype=np.intp)
+        block = max(1, 2 ** 22 // m)
+        for start in range(0, m, block):
+            rows = np.arange(start, min(start + block, m))
+            out[rows] = _nearest_k(self.rows(rows), k, rows)
+        return out.tolist()
+
+    def length(self, tour: List[int]) -> int:
+        d = self.d
+        return sum(d(tour[i - 1], tour[i]) for i in range(len(tour)))
+
+    def __len__(self) -> int:
+        return self.m
+
+
+def _candidate_neighbours(d: List[List[int]], k: int = 10) -> List[List[int]]:
+    m = len(d)
+    k = min(k, m - 1)
+    if k <= 0:
+        return [[] for _ in range(m)]
+    return _nearest_k(np.asarray(d, dtype=np.float64), k).tolist()
+
+
+def _local_candidates(nodes: List[int], matrix, d, k: int = 10) -> List[List[int]]:
+    # Candidate lists in local indices (positions in `nodes`). When the
+    # nodes cover the whole instance, the lists cached on a CondensedMatrix
+    # or EuclideanInstance are reused, so every engine run on that instance
+    # shares one O(n * k) preprocessing step; a subset of a EuclideanInstance
+    # asks a k-d tree, anything else falls back to d, a local table or a
+    # _LocalMetric scanned a block of rows at a time.
+    m = len(nodes)
+    if hasattr(matrix, "neighbours") and m == len(matrix):
+        idx = np.asarray(nodes, dtype=np.intp)
+        pos = np.empty(m, dtype=np.intp)
+        pos[idx] = np.arange(m)
+        return pos[matrix.neighbours(k)[idx]].tolist()
+    if isinstance(matrix, EuclideanInstance):
+        return matrix.tree(nodes).k_nearest_all(k).tolist()
+    if isinstance(d, _LocalMetric):
+        return d.neighbours(k)
+    return _candidate_neighbours(d, k)
+
+
+def _nearest_neighbour_tour(d, neighbours: List[List[int]]) -> List[int]:
+    # `d` is a local table or a _LocalMetric. When every candidate is
+    # visited, the nearest unvisited city comes from the k-d tree of a
+    # Euclidean metric or from one vectorised row scan.
+    m = len(d)
+    tree = None
+    if isinstance(d, _LocalMetric) and d.points is not None:
+        tree = d.points.tree(list(range(m)))
+        tree.remove(0)
+    visited = [False] * m
+    visited[0] = True
+    unvisited = np.ones(m, dtype=bool)
+    unvisited[0] = False
+    tour = [0]
+    current = 0
+    for _ in range(m - 1):
+        nxt = -1
+        for c in neighbours[current]:
+            if not visited[c]:
+                nxt = c
+                break
+        if nxt < 0:
+            if tree is not None:
+                nxt = tree.nearest_to(current)
+            else:
+                row = d.row(current) if isinstance(d, _LocalMetric) else np.asarray(d[current])
+                nxt = int(np.flatnonzero(unvisited)[np.argmin(row[unvisited])])
+        visited[nxt] = True
+        unvisited[nxt] = False
+        if tree is not None:
+            tree.remove(nxt)
+        tour.append(nxt)
+        current = nxt
+    return tour
+
+
+class _TourOptimizer:
+    # 2-opt and Or-opt moves driven by candidate neighbour lists and
+    # don't-look bits; the tour is an array of local indices plus its inverse.
+
+    def __init__(self, d: Callable[[int, int], int], neighbours: List[List[int]], tour: List[int]):
+        self.d = d # d(i, j), e.g. _LocalMetric.d
+        self.neighbours = neighbours
+        self.tour = tour
+        self.m = len(tour)
+        self.pos = [0] * self.m
+        for i, c in enumerate(tour):
+            self.pos[c] = i
+
+    def succ(self, c: int) -> int:
+        return self.tour[(self.pos[c] + 1) % self.m]
+
+    def pred(self, c: int) -> int:
+        return self.tour[self.pos[c] - 1]
+
+    def reverse(self, a: int, b: int) -> None:
+        # reverse the path a..b (in tour order), or its complement when shorter
+        tour, pos, m = self.tour, self.pos, self.m
+        i, j = pos[a], pos[b]
+        length = (j - i) % m + 1
+        if 2 * length > m:
+            i, j = (j + 1) % m, (i - 1) % m
+            length = m - length
+        for _ in range(length // 2):
+            ci, cj = tour[i], tour[j]
+            tour[i], tour[j] = cj, ci
+            pos[cj], pos[ci] = i, j
+            i = (i + 1) % m
+            j = (j - 1) % m
+
+    def length(self) -> int:
+        d, tour = self.d, self.tour
+        return sum(d(tour[i - 1], tour[i]) for i in range(self.m))
+
+    def _try_two_opt(self, a: int):
+        d = self.d
+        for forward in (True, False):
+            b = self.succ(a) if forward else self.pred(a)
+            d_ab = d(a, b)
+            for c in self.neighbours[a]:
+                d_ac = d(a, c)
+                if d_ac >= d_ab:
+                    break
+                e = self.succ(c) if forward else self.pred(c)
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d(b, e) - d_ab - d(c, e)
+                if delta < 0:
+                    if forward:
+                        self.reverse(b, c)
+                    else:
+                        self.reverse(c, b)
+                    return (a, b, c, e)
+        return None
+
+    def _try_or_opt(self, a: int):
+        d, m = self.d, self.m
+        for seg_len in (1, 2, 3):
+            if seg_len > m - 3:
+                break
+            start = self.pos[a]
+            segment = [self.tour[(start + k) % m] for k in range(seg_len)]
+            s1, s2 = segment[0], segment[-1]
+            p = self.pred(s1)
+            n = self.succ(s2)
+            removal_gain = d(p, s1) + d(s2, n) - d(p, n)
+            if removal_gain <= 0:
+                continue
+            inside = set(segment)
+            for x in self.neighbours[s1] + self.neighbours[s2]:
+                if x in inside:
+                    continue
+                for c, e in ((x, self.succ(x)), (self.pred(x), x)):
+                    if c in inside or e in inside or (c == p and e == n):
+                        continue
+                    d_ce = d(c, e)
+                    straight = d(c, s1) + d(s2, e) - d_ce
+                    flipped = d(c, s2) + d(s1, e) - d_ce
+                    if min(straight, flipped) < removal_gain:
+                        self._move_segment(segment, c, flipped < straight)
+                        return (p, n, c, e, s1, s2)
+        return None
+
+    def _move_segment(self, segment: List[int], c: int, flip: bool) -> None:
+        # Re-insert `segment` between c and succ(c) in place: the cities on
+        # the shorter side between the segment and the gap slide over by
+        # len(segment), so only they and the segment change position.
+        tour, pos, m = self.tour, self.pos, self.m
+        size = len(segment)
+        i = pos[segment[0]]
+        after = (pos[c] - i - size) % m + 1 # cities from succ(segment) to c
+        if 2 * after <= m - size:
+            src, dst = (i + size) % m, i
+            for _ in range(after):
+                city = tour[src]
+                tour[dst], pos[city] = city, dst
+                src, dst = (src + 1) % m, (dst + 1) % m
+        else:
+            # slide succ(c)..pred(segment) forward instead
+            src, dst = (i - 1) % m, (i + size - 1) % m
+            for _ in range(m - size - after):
+                city = tour[src]
+                tour[dst], pos[city] = city, dst
+                src, dst = (src - 1) % m, (dst - 1) % m
+            dst = (dst - size + 1) % m
+        for city in (segment[::-1] if flip else segment):
+            tour[dst], pos[city] = city, dst
+            dst = (dst + 1) % m
+
+    def optimize(self, active: List[int], deadline: Optional[float] = None) -> bool:
+        # returns False when `deadline` cut the pass short
+        queue = collections.deque(active)
+        queued = [False] * self.m
+        for c in active:
+            queued[c] = True
+        steps = 0
+        while queue:
+            steps += 1
+            if deadline is not None and steps & 255 == 0 and time.monotonic() >= deadline:
+                return False
+            a = queue.popleft()
+            queued[a] = False
+            touched = self._try_two_opt(a) or self._try_or_opt(a)
+            if touched:
+                for c in touched + (a,):
+                    if not queued[c]:
+                        queued[c] = True
+                        queue.append(c)
+        return True
+
+    def double_bridge(self, rng: random.Random) -> List[int]:
+        m = self.m
+        i, j, k = sorted(rng.sample(range(1, m), 3))
+        tour = self.tour
+        self.tour = tour[:i] + tour[j:k] + tour[i:j] + tour[k:]
+        for idx, city in enumerate(self.tour):
+            self.pos[city] = idx
+        return [tour[i - 1], tour[i], tour[j - 1], tour[j], tour[k - 1], tour[k % m]]
+
+
+def tsp_lin_kernighan(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    kicks: int = 50,
+    neighbours_k: int = 10,
+    seed: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    nodes = [home] + list(selected)
+    m = len(nodes)
+
+    if m <= 3:
+        route = nodes + [home]
+        return {"route": route, "distance": int(route_distance(matrix, route)), "timedOut": False}
+
+    metric = _LocalMetric(nodes, matrix)
+    neighbours = _local_candidates(nodes, matrix, metric, neighbours_k)
+    opt = _TourOptimizer(metric.d, neighbours, _nearest_neighbour_tour(metric, neighbours))
+    timed_out = not opt.optimize(list(range(m)), deadline)
+
+    # iterated local search: perturb with a double-bridge kick, re-optimise
+    # around the touched cities only, keep the result if it is no worse
+    if m >= 8 and not timed_out:
+        rng = random.Random(seed)
+        best_tour, best_len = opt.tour[:], opt.length()
+        for _ in range(kicks):
+            if deadline is not None and time.monotonic() >= deadline:
+                timed_out = True
+                break
+            touched = opt.double_bridge(rng)
+            opt.optimize(touched, deadline)
+            new_len = opt.length()
+            if new_len <= best_len:
+                best_tour, best_len = opt.tour[:], new_len
+            else:
+                opt.tour = best_tour[:]
+                for idx, city in enumerate(opt.tour):
+                    opt.pos[city] = idx
+
+    tour = opt.tour
+    start = tour.index(0)
+    tour = tour[start:] + tour[:start]
+    route = [nodes[c] for c in tour] + [home]
+    return {"route": route, "distance": int(route_distance(matrix, route)), "timedOut": timed_out}
+
+def iter_improving_tours(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    budget_ms: float = 5000.0,
+    neighbours_k: int = 10,
+    seed: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    # Anytime solver: yields the nearest-neighbour tour, then every new best
+    # tour found by 2-opt/Or-opt descent and double-bridge restarts, until
+    # the budget is spent or the consumer closes the generator.
+    start = time.monotonic()
+    deadline = start + budget_ms / 1000.0
+    nodes = [home] + list(selected)
+    m = len(nodes)
+    metric = _LocalMetric(nodes, matrix)
+
+    def snapshot(tour: List[int], length: int, phase: str) -> Dict[str, Any]:
+        at = tour.index(0)
+        route = [nodes[c] for c in tour[at:] + tour[:at]] + [home]
+        return {
+            "route": route,
+            "distance": int(length),
+            "elapsedMs": (time.monotonic() - start) * 1000.0,
+            "phase": phase,
+        }
+
+    if m <= 3:
+        tour = list(range(m))
+        yield snapshot(tour, metric.length(tour), "exact")
+        return
+
+    neighbours = _local_candidates(nodes, matrix, metric, neighbours_k)
+    opt = _TourOptimizer(metric.d, neighbours, _nearest_neighbour_tour(metric, neighbours))
+    best_len = opt.length()
+    yield snapshot(opt.tour, best_len, "nearest_neighbor")
+
+    opt.optimize(list(range(m)), deadline)
+    best_tour = opt.tour[:]
+    if opt.length() < best_len:
+        best_len = opt.length()
+        yield snapshot(best_tour, best_len, "local_search")
+
+    if m < 8:
+        return
+
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        touched = opt.double_bridge(rng)
+        opt.optimize(touched, deadline)
+        new_len = opt.length()
+        if new_len < best_len:
+            best_tour, best_len = opt.tour[:], new_len
+            yield snapshot(best_tour, best_len, "restart")
+        elif new_len > best_len:
+            opt.tour = best_tour[:]
+            for idx, city in enumerate(opt.tour):
+                opt.pos[city] = idx
+
+
+ALGORITHMS = {
+    "bruteforce": tsp_bruteforce,
+    "nearest_neighbor": tsp_nearest_neighbor,
+    "greedy_edge": tsp_greedy_edge,
+    "mst_prim": tsp_mst_prim,
+    "random_search": tsp_random_search,
+    "lin_kernighan": tsp_lin_kernighan,
+    "christofides": tsp_christofides,
+    "simulated_annealing": tsp_simulated_annealing,
+    "genetic": tsp_genetic,
+    "ant_colony": tsp_ant_colony,
+}
+
+# engines whose result, when they finish in time, is a proven optimum
+EXACT_ALGORITHMS = ("bruteforce",)
+
+# engines that never build a distance table when given a EuclideanInstance
+MATRIX_FREE_ALGORITHMS = ("nearest_neighbor", "greedy_edge", "lin_kernighan")
+
+
+# how long past its budget an engine may take to notice the deadline before
+# the caller stops waiting for it
+BUDGET_GRACE_MS = 50.0
+
+# engines with a run that overran its budget and is still going; they are
+# not started again until it ends, so stragglers cannot pile up
+_stragglers = set()
+_stragglers_lock = threading.Lock()
+
+
+def _timed_out(home: int, selected: List[int], matrix) -> Dict[str, Any]:
+    result = tsp_nearest_neighbor(home, selected, matrix)
+    result["timedOut"] = True
+    return result
+
+
+def _run_with_budget(fn, home: int, selected: List[int], matrix, budget_ms: float) -> Dict[str, Any]:
+    # Engines that take a `deadline` stop themselves and return their best
+    # tour so far. If one overruns anyway, the caller stops waiting and
+    # answers with a nearest-neighbour tour; the engine finishes on its own
+    # daemon thread and its late result is discarded. An engine that is
+    # out of time, or still overrunning from an earlier call, is not run.
+    with _stragglers_lock:
+        busy = fn in _stragglers
+    if budget_ms <= 0 or busy:
+        return _timed_out(home, selected, matrix)
+
+    kwargs = {}
+    if "deadline" in inspect.signature(fn).parameters:
+        kwargs["deadline"] = time.monotonic() + budget_ms / 1000.0
+
+    future: "concurrent.futures.Future[Dict[str, Any]]" = concurrent.futures.Future()
+
+    def work() -> None:
+        try:
+            future.set_result(fn(home, selected, matrix, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=work, name="tsp-engine", daemon=True).start()
+    try:
+        return future.result(timeout=(budget_ms + BUDGET_GRACE_MS) / 1000.0)
+    except concurrent.futures.TimeoutError:
+        with _stragglers_lock:
+            _stragglers.add(fn)
+        future.add_done_callback(lambda _: _forget_straggler(fn))
+        return _timed_out(home, selected, matrix)
+
+
+def _forget_straggler(fn) -> None:
+    with _stragglers_lock:
+        _stragglers.discard(fn)
+
+
+def run_algorithms(
+    home: int,
+    selected: List[int],
+    matrix: List[List[int]],
+    cache=None,
+    retime: bool = False,
+    budget_ms: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    # `cache` is a result_cache.ResultCache. A hit is served as-is (flagged
+    # "cached", timings from the original run); retime=True always runs the
+    # engines again and refreshes the entry, for the performance charts.
+    # The selection is sorted first so results depend only on the instance.
+    # `budget_ms` caps the whole call: every engine runs in a worker thread
+    # with whatever is left of it as its deadline, as does the bound, and
+    # reports "timedOut" when it had to stop early (or never started).
+    # "exact" marks a finished run of an EXACT_ALGORITHMS engine: only that
+    # is the instance's optimum, a timed-out one is just another tour.
+    # Every result carries the instance's Held-Karp "lowerBound" and its
+    # "gapPct" above it, a guaranteed upper bound on its optimality gap;
+    # both are None when the bound ran out of time.
+    selected = sorted(selected)
+
+    key = None
+    if cache is not None:
+        key = cache.key_for(home, selected, matrix)
+        if not retime:
+            cached = cache.get(key)
+            if cached is not None:
+                for result in cached.values():
+                    result["cached"] = True
+                return cached
+
+    deadline = None if budget_ms is None else time.monotonic() + budget_ms / 1000.0
     results: Dict[str, Dict[str, Any]] = {}
-    for name, fn in algorithms.items():
+    for name, fn in ALGORITHMS.items():
         start = time.perf_counter()
-        result = fn(home, selected, matrix)
+        if deadline is None:
+            result = fn(home, selected, matrix)
+        else:
+            remaining_ms = (deadline - time.monotonic()) * 1000.0
+            result = _run_with_budget(fn, home, selected, matrix, remaining_ms)
         duration_ms = (time.perf_counter() - start) * 1000.0
         result["durationMs"] = duration_ms
+        result.setdefault("timedOut", False)
+        result["exact"] = name in EXACT_ALGORITHMS and not result["timedOut"]
         results[name] = result
 
+    upper = min(r["distance"] for r in results.values())
+    bound = lower_bound_or_none(
+        held_karp_lower_bound(home, selected, matrix, upper=upper, deadline=deadline)
+    )
+    for result in results.values():
+        result["lowerBound"] = bound
+        result["gapPct"] = gap_pct(result["distance"], bound)
+
+    # a best-so-far answer is not the instance's answer, so it is not cached
+    if cache is not None and bound is not None and not any(r["timedOut"] for r in results.values()):
+        cache.put(key, results)
+
     return results
@@ -1,47 +1,76 @@
+import inspect
 import json
 import random
+import time
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 
-from config import CITIES
-from db import get_db, init_db
+from config import (
+    ALGORITHM_BUDGET_MS,
+    BRUTEFORCE_PROCESSES,
+    CITIES,
+    JOB_MAX_BUDGET_MS,
+    JOB_MAX_CITIES,
+    JOB_MAX_DENSE_CITIES,
+    JOB_QUEUE_SIZE,
+    JOB_RESULT_TTL_S,
+    JOB_WORKERS,
+    RESULT_CACHE_SIZE,
+    SESSION_CACHE_SIZE,
+    STREAM_DEFAULT_BUDGET_MS,
+    STREAM_MAX_BUDGET_MS,
+    STREAM_MAX_CITIES,
+)
+from db import get_db, init_db, release_db
+from jobs import JobQueue
+from result_cache import ResultCache
+from sessions import SessionStore
 from algorithms import (
-    generate_random_matrix,
+    ALGORITHMS,
+    MATRIX_FREE_ALGORITHMS,
+    CondensedMatrix,
+    EuclideanInstance,
+    gap_pct,
+    held_karp_lower_bound,
+    iter_improving_tours,
+    lower_bound_or_none,
     route_distance,
     run_algorithms,
+    set_bruteforce_processes,
+    warm_bruteforce_pool,
 )
+import tsplib
+from benchmark import EXACT_ENGINE_MAX_K
 
+# Importing this module only builds the app; create_app() initialises the
+# database and starts the workers. Brute-force worker processes are spawned
+# and re-import the __main__ module, so the module body must stay free of
+# side effects.
 app = Flask(__name__)
 CORS(app)
+app.teardown_appcontext(release_db)
 
-init_db()
-
+session_store = SessionStore(SESSION_CACHE_SIZE)
+result_cache = ResultCache(RESULT_CACHE_SIZE)
 
 
 def _parse_round_payload(data):
     player_name = (data.get("playerName") or "").strip()
     route_between = data.get("routeBetween") or []
-    home_city = data.get("homeCity")
-    matrix = data.get("distanceMatrix")
+    session_id = data.get("sessionId")
 
     if not player_name:
         return None, jsonify({"error": "playerName is required"}), 400
     if not route_between:
         return None, jsonify({"error": "routeBetween must contain at least one city"}), 400
-    if not home_city:
-        return None, jsonify({"error": "homeCity is required"}), 400
-    if home_city not in CITIES:
-        return None, jsonify({"error": "Invalid homeCity"}), 400
-    if not isinstance(matrix, list) or not matrix:
-        return None, jsonify({"error": "distanceMatrix is required"}), 400
-
-    n = len(CITIES)
-    if len(matrix) != n or any(not isinstance(row, list) or len(row) != n for row in matrix):
-        return None, jsonify({"error": f"distanceMatrix must be a {n}x{n} matrix"}), 400
-    for i in range(n):
-        if matrix[i][i] != 0:
-            return None, jsonify({"error": "distanceMatrix diagonal must be 0"}), 400
+    if not isinstance(session_id, int) or isinstance(session_id, bool):
+        return None, jsonify({"error": "sessionId is required"}), 400
+
+    session = session_store.get(session_id)
+    if session is None:
+        return None, jsonify({"error": "Unknown sessionId"}), 404
+    home_city, matrix = session
 
     try:
         selected_indices = [CITIES.index(c) for c in route_between]
@@ -62,6 +91,7 @@ def _parse_round_payload(data):
     return {
         "player_name": player_name,
         "route_between": route_between,
+        "session_id": session_id,
         "home_city": home_city,
         "home_index": home_index,
         "matrix": matrix,
@@ -71,16 +101,18 @@ def _parse_round_payload(data):
 @app.route("/api/new-game", methods=["POST"])
 def new_game():
     try:
-        matrix = generate_random_matrix(len(CITIES))
+        matrix = CondensedMatrix.random(len(CITIES))
         home_index = random.randint(0, len(CITIES) - 1)
         home_city = CITIES[home_index]
+        session_id = session_store.create(home_city, matrix)
 
         return jsonify(
             {
+                "sessionId": session_id,
                 "cities": CITIES,
                 "homeCity": home_city,
                 "homeIndex": home_index,
-                "distanceMatrix": matrix,
+                "distanceMatrix": matrix.tolist(),
             }
         )
     except Exception as e:
@@ -99,41 +131,58 @@ def check_answer():
         player_name = parsed["player_name"]
         route_between = parsed["route_between"]
         home_city = parsed["home_city"]
+        session_id = parsed["session_id"]
         home_index = parsed["home_index"]
         matrix = parsed["matrix"]
         selected_indices = parsed["selected_indices"]
 
-        algo_results = run_algorithms(home_index, selected_indices, matrix)
+        retime = bool(data.get("retime"))
+        algo_results = run_algorithms(
+            home_index,
+            selected_indices,
+            matrix,
+            cache=result_cache,
+            retime=retime,
+            budget_ms=ALGORITHM_BUDGET_MS,
+        )
+        cached = any(res.get("cached") for res in algo_results.values())
 
         optimal = algo_results["bruteforce"]
         optimal_route = optimal["route"]
         optimal_distance = optimal["distance"]
+        exact = optimal["exact"]
 
         user_route_indices = [home_index] + [CITIES.index(c) for c in route_between] + [home_index]
         user_distance = route_distance(matrix, user_route_indices)
 
-        correct = user_route_indices == optimal_route
+        # the engines see the selection as a set, so a tied or mirrored
+        # optimal tour counts as correct. A brute force that ran out of time
+        # proves nothing, so the round is not graded (correct is None) and
+        # its tour is never stored as the shortest route.
+        correct = user_distance <= optimal_distance if exact else None
 
         conn = get_db()
         cur = conn.cursor()
 
-        cur.execute(
-            "INSERT INTO sessions (home_city, distance_matrix) VALUES (?, ?)",
-            (home_city, json.dumps(matrix)),
-        )
-        session_id = cur.lastrowid
-
         cur.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (player_name,))
         cur.execute("SELECT id FROM players WHERE name = ?", (player_name,))
         player_id = cur.fetchone()["id"]
 
-        for name, res in algo_results.items():
+        if not cached:
             cur.execute(
+                "INSERT INTO checks (session_id, player_id, cities) VALUES (?, ?, ?)",
+                (session_id, player_id, len(selected_indices) + 1),
+            )
+            check_id = cur.lastrowid
+            cur.executemany(
                 """
-                INSERT INTO algorithm_runs (session_id, algorithm_name, duration_ms, distance)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO algorithm_runs (session_id, check_id, algorithm_name, duration_ms, distance)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (session_id, name, float(res["durationMs"]), int(res["distance"])),
+                [
+                    (session_id, check_id, name, float(res["durationMs"]), int(res["distance"]))
+                    for name, res in algo_results.items()
+                ],
             )
 
         if correct:
@@ -148,25 +197,37 @@ def check_answer():
             )
 
         conn.commit()
-        conn.close()
 
         response = {
             "sessionId": session_id,
             "correct": correct,
+            "cached": cached,
             "homeCity": home_city,
             "yourRoute": [CITIES[i] for i in user_route_indices],
             "yourDistance": user_distance,
+            "exact": exact,
             "optimalRoute": [CITIES[i] for i in optimal_route],
             "optimalDistance": optimal_distance,
+            "lowerBound": optimal["lowerBound"],
             "algorithms": {
                 name: {
                     "route": [CITIES[i] for i in res["route"]],
                     "distance": int(res["distance"]),
                     "durationMs": float(res["durationMs"]),
+                    "timedOut": bool(res.get("timedOut")),
+                    "exact": bool(res.get("exact")),
+                    "gapPct": res["gapPct"],
+                    "convergence": res.get("convergence"),
                 }
                 for name, res in algo_results.items()
             },
-            "message": "Correct! Well done." if correct else "Not quite. Check the optimal route below.",
+            "message": (
+                "Correct! Well done."
+                if correct
+                else "Not quite. Check the optimal route below."
+                if exact
+                else "The exact search ran out of time, so this round cannot be graded. The best route found is below."
+            ),
         }
         return jsonify(response)
 
@@ -174,18 +235,248 @@ def check_answer():
         return jsonify({"error": str(e)}), 500
 
 
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route("/api/solve-stream", methods=["GET"])
+def solve_stream():
+    # Server-Sent Events: one "improvement" event per new best tour, then
+    # "done". Either replays a game session (?sessionId=, optional
+    # ?cities=B,C,D) or solves a fresh random instance (?n=, optional ?seed=).
+    budget_ms = request.args.get("budgetMs", default=STREAM_DEFAULT_BUDGET_MS, type=float)
+    if budget_ms <= 0 or budget_ms > STREAM_MAX_BUDGET_MS:
+        return jsonify({"error": f"budgetMs must be between 0 and {STREAM_MAX_BUDGET_MS}"}), 400
+
+    session_id = request.args.get("sessionId", type=int)
+    if session_id is not None:
+        session = session_store.get(session_id)
+        if session is None:
+            return jsonify({"error": "Unknown sessionId"}), 404
+        home_city, matrix = session
+        home = CITIES.index(home_city)
+        letters = [c for c in request.args.get("cities", "").split(",") if c]
+        if any(c not in CITIES or c == home_city for c in letters):
+            return jsonify({"error": "Invalid city in cities"}), 400
+        selected = [CITIES.index(c) for c in letters] or [i for i in range(len(CITIES)) if i != home]
+    else:
+        n = request.args.get("n", type=int)
+        if n is None or n < 2 or n > STREAM_MAX_CITIES:
+            return jsonify({"error": f"sessionId or n (2..{STREAM_MAX_CITIES}) is required"}), 400
+        matrix = CondensedMatrix.random(n, seed=request.args.get("seed", type=int))
+        home = 0
+        selected = list(range(1, n))
+
+    def events():
+        best = None
+        for best in iter_improving_tours(home, selected, matrix, budget_ms=budget_ms):
+            yield _sse("improvement", best)
+        yield _sse("done", {"distance": best["distance"], "elapsedMs": best["elapsedMs"]})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _job_spec(data):
+    # Validates a POST /api/jobs body into the spec a worker runs. The
+    # instance is one of: a game session ("sessionId", optional "cities"),
+    # a seeded random instance ("n", "seed", "kind": random|euclidean),
+    # explicit "points" [[x, y], ...], or a TSPLIB file ("tsplib": name).
+    # Returns (spec, error response, status code) like _parse_round_payload.
+    budget_ms = data.get("budgetMs", STREAM_DEFAULT_BUDGET_MS)
+    if not isinstance(budget_ms, (int, float)) or budget_ms <= 0 or budget_ms > JOB_MAX_BUDGET_MS:
+        return None, jsonify({"error": f"budgetMs must be between 0 and {JOB_MAX_BUDGET_MS}"}), 400
+    spec = {"budgetMs": float(budget_ms)}
+
+    if data.get("sessionId") is not None:
+        session_id = data["sessionId"]
+        if not isinstance(session_id, int) or isinstance(session_id, bool):
+            return None, jsonify({"error": "sessionId must be an integer"}), 400
+        session = session_store.get(session_id)
+        if session is None:
+            return None, jsonify({"error": "Unknown sessionId"}), 404
+        home_city = session[0]
+        cities = data.get("cities") or ""
+        if not isinstance(cities, str):
+            return None, jsonify({"error": "cities must be a comma-separated string"}), 400
+        letters = [c for c in cities.split(",") if c]
+        if any(c not in CITIES or c == home_city for c in letters) or len(set(letters)) != len(letters):
+            return None, jsonify({"error": "Invalid city in cities"}), 400
+        spec.update(sessionId=session_id, cities=letters)
+        n, coordinates = (len(letters) + 1 if letters else len(CITIES)), False
+    elif data.get("tsplib") is not None:
+        name = data["tsplib"]
+        if not isinstance(name, str):
+            return None, jsonify({"error": "tsplib must be the name of a vendored instance"}), 400
+        try:
+            path = tsplib.vendored(name)
+        except FileNotFoundError:
+            return None, jsonify({"error": "Unknown TSPLIB instance"}), 404
+        try:
+            instance = tsplib.load(path)
+        except (OSError, ValueError, KeyError):
+            # never echo the parser's message: it quotes the file
+            return None, jsonify({"error": "Cannot load TSPLIB instance"}), 400
+        spec["tsplib"] = name
+        n, coordinates = instance["dimension"], isinstance(instance["matrix"], EuclideanInstance)
+    elif data.get("points") is not None:
+        points = data["points"]
+        if not isinstance(points, list) or not all(
+            isinstance(p, list) and len(p) == 2 and all(isinstance(v, (int, float)) for v in p)
+            for p in points
+        ):
+            return None, jsonify({"error": "points must be a list of [x, y] pairs"}), 400
+        spec["points"] = points
+        n, coordinates = len(points), True
+    else:
+        n, kind = data.get("n"), data.get("kind", "random")
+        if not isinstance(n, int) or kind not in ("random", "euclidean"):
+            message = "sessionId, tsplib, points or n (with kind random|euclidean) is required"
+            return None, jsonify({"error": message}), 400
+        seed = data.get("seed")
+        if seed is not None and not isinstance(seed, int):
+            return None, jsonify({"error": "seed must be an integer"}), 400
+        spec.update(n=n, kind=kind, seed=seed)
+        coordinates = kind == "euclidean"
+
+    if n < 3 or n > JOB_MAX_CITIES:
+        return None, jsonify({"error": f"instances must have 3..{JOB_MAX_CITIES} cities"}), 400
+
+    # exact engines only run up to the sizes the benchmark allows them
+    k = n - 1
+    names = data.get("algorithms")
+    if names is None:
+        names = [a for a in ALGORITHMS if k <= EXACT_ENGINE_MAX_K.get(a, k)]
+        if n > JOB_MAX_DENSE_CITIES:
+            names = [a for a in names if a in MATRIX_FREE_ALGORITHMS]
+    if not isinstance(names, list) or not names or any(not isinstance(a, str) or a not in ALGORITHMS for a in names):
+        return None, jsonify({"error": "algorithms must be a non-empty list of registered engines"}), 400
+    too_big = [a for a in names if k > EXACT_ENGINE_MAX_K.get(a, k)]
+    if too_big:
+        limits = ", ".join(f"{a} up to {EXACT_ENGINE_MAX_K[a] + 1} cities" for a in too_big)
+        return None, jsonify({"error": f"instance too large: {limits}"}), 400
+    if n > JOB_MAX_DENSE_CITIES:
+        dense = [a for a in names if not coordinates or a not in MATRIX_FREE_ALGORITHMS]
+        if dense:
+            message = (
+                f"above {JOB_MAX_DENSE_CITIES} cities only coordinate instances with "
+                f"{', '.join(MATRIX_FREE_ALGORITHMS)} are supported"
+            )
+            return None, jsonify({"error": message}), 400
+    spec["algorithms"] = names
+    return spec, None, None
+
+
+def _job_instance(spec):
+    if "sessionId" in spec:
+        home_city, matrix = session_store.get(spec["sessionId"])
+        home = CITIES.index(home_city)
+        selected = [CITIES.index(c) for c in spec["cities"]] or [
+            i for i in range(len(CITIES)) if i != home
+        ]
+        return home, selected, matrix
+    if "tsplib" in spec:
+        return tsplib.as_problem(tsplib.load(tsplib.vendored(spec["tsplib"])))
+    if "points" in spec:
+        matrix = EuclideanInstance(spec["points"])
+    elif spec["kind"] == "euclidean":
+        matrix = EuclideanInstance.random(spec["n"], seed=spec["seed"])
+    else:
+        matrix = CondensedMatrix.random(spec["n"], seed=spec["seed"])
+    return 0, list(range(1, len(matrix))), matrix
+
+
+def _run_solve_job(spec, progress):
+    # Runs in a job worker thread, engines one after another, each with the
+    # job's budget as its deadline. The Held-Karp bound is added when the
+    # instance is small enough for a distance table.
+    home, selected, matrix = _job_instance(spec)
+    names = spec["algorithms"]
+    budget_s = spec["budgetMs"] / 1000.0
+
+    results = {}
+    for i, name in enumerate(names):
+        progress({"done": i, "total": len(names), "current": name})
+        fn = ALGORITHMS[name]
+        kwargs = {}
+        if "deadline" in inspect.signature(fn).parameters:
+            kwargs["deadline"] = time.monotonic() + budget_s
+        start = time.perf_counter()
+        res = fn(home, selected, matrix, **kwargs)
+        results[name] = {
+            "route": res["route"],
+            "distance": int(res["distance"]),
+            "durationMs": (time.perf_counter() - start) * 1000.0,
+            "timedOut": bool(res.get("timedOut")),
+        }
+    progress({"done": len(names), "total": len(names), "current": None})
+
+    lower_bound = None
+    if len(selected) + 1 <= JOB_MAX_DENSE_CITIES:
+        upper = min(r["distance"] for r in results.values())
+        lower_bound = lower_bound_or_none(
+            held_karp_lower_bound(home, selected, matrix, upper=upper, deadline=time.monotonic() + budget_s)
+        )
+        for res in results.values():
+            res["gapPct"] = gap_pct(res["distance"], lower_bound)
+    return {"cities": len(selected) + 1, "home": home, "lowerBound": lower_bound, "algorithms": results}
+
+
+job_queue = JobQueue(_run_solve_job, JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RESULT_TTL_S)
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    # 202 with the job id; 429 when the queue is full (retry later)
+    data = request.get_json(force=True, silent=True) or {}
+    spec, err_resp, err_code = _job_spec(data)
+    if err_resp is not None:
+        return err_resp, err_code
+
+    job_id = job_queue.submit(spec)
+    if job_id is None:
+        resp = jsonify({"error": "Too many queued jobs, try again later"})
+        resp.headers["Retry-After"] = "5"
+        return resp, 429
+    return jsonify({"jobId": job_id, "status": "queued", "statusUrl": f"/api/jobs/{job_id}"}), 202
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job)
+
+
 @app.route("/api/complexity", methods=["GET"])
 def complexity():
     return jsonify(
         {
-            "bruteforce": "O(k!) where k is the number of selected cities (exact search over all permutations).",
-            "nearest_neighbor": "O(k^2) - greedy algorithm: for each step, scan the remaining cities to find the nearest one.",
-            "mst_prim": "O(k^2) - build a Minimum Spanning Tree with Prim's algorithm, then do a DFS traversal.",
-            "random_search": "O(I * k) where I is the number of random permutations sampled.",
+            "bruteforce": "O(k!) where k is the number of selected cities (exact depth-first search over all permutations with running prefix sums, pruning and mirror-tour skipping).",
+            "nearest_neighbor": "O(k * c) after candidate lists - each step takes the first unvisited city among the c nearest, scanning all cities only when those are used up (a k-d tree query on coordinate instances).",
+            "greedy_edge": "O(k * c log(k * c)) after candidate lists - add the shortest of the c-nearest-neighbour edges that keep every degree <= 2 and close no cycle, then chain the paths end to nearest end.",
+            "mst_prim": "O(k^2) - build a Minimum Spanning Tree with Prim's algorithm (key/parent arrays), then do an iterative DFS preorder walk.",
+            "random_search": "O(I * k) where I is the number of random permutations sampled (scored in vectorised batches until the sample count or time budget is reached).",
+            "lin_kernighan": "O(k^2) setup for candidate lists, then roughly O(k * c) per pass - 2-opt and Or-opt moves over c nearest neighbours with don't-look bits.",
+            "christofides": "O(k^2 + 2^t * t) - MST, minimum-weight perfect matching on the t odd-degree vertices (exact up to t = 20, greedy beyond), Euler circuit and shortcutting; at most 1.5x optimal on metric instances.",
+            "simulated_annealing": "O(I) after O(k^2) setup - I random 2-opt moves, each scored by an O(1) delta and accepted by the Metropolis rule; O(k) per accepted move.",
+            "genetic": "O(G * P * k) - G generations of P tours; tournament selection, order crossover and inversion mutation, with the whole population scored in one vectorised pass.",
+            "ant_colony": "O(I * A * k * c) - I iterations of A ants building tours in lock-step, each step a vectorised roulette over c candidate neighbours; evaporation and deposit are whole-matrix updates.",
+            "held_karp": "O(2^k * k^2) time, O(2^k * k) memory - exact dynamic programme over subsets, one popcount layer at a time; gives the benchmark its optimum up to k ~ 20.",
+            "held_karp_lower_bound": "O(I * k^2) - I subgradient steps on minimum 1-trees; every step is a lower bound on the optimal tour, so reported gaps can only overstate the distance from optimal.",
         }
     )
 
 
+@app.route("/api/cache-stats", methods=["GET"])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+
 @app.route("/api/performance", methods=["GET"])
 def performance():
     try:
@@ -193,73 +484,70 @@ def performance():
         if limit <= 0 or limit > 200:
             limit = 15
 
-        conn = get_db()
-        cur = conn.cursor()
-
+        # one pivoting query over the newest `limit` checks: a session can be
+        # checked many times with different cities, so each row is one check
+        # and its runs come straight off the (check_id, algorithm_name) index
+        pivot = ",\n".join(
+            f"MAX(CASE WHEN r.algorithm_name = '{name}' THEN r.duration_ms END) AS {name}"
+            for name in ALGORITHMS
+        )
+        cur = get_db().cursor()
         cur.execute(
-            """
+            f"""
             SELECT
-                s.id AS session_id,
+                c.id AS check_id,
+                c.session_id,
+                c.cities,
+                c.created_at,
                 s.home_city,
-                s.created_at,
-                p.name AS player_name
-            FROM sessions s
-            LEFT JOIN games g ON g.session_id = s.id
-            LEFT JOIN players p ON p.id = g.player_id
-            ORDER BY s.id DESC
-            LIMIT ?
+                p.name AS player_name,
+                {pivot}
+            FROM (
+                SELECT id
+                FROM checks
+                ORDER BY id DESC
+                LIMIT ?
+            ) recent
+            JOIN checks c ON c.id = recent.id
+            JOIN sessions s ON s.id = c.session_id
+            LEFT JOIN players p ON p.id = c.player_id
+            JOIN algorithm_runs r ON r.check_id = c.id
+            GROUP BY c.id
+            ORDER BY c.id
             """,
             (limit,),
         )
-        sessions = cur.fetchall()
-
-        if not sessions:
-            conn.close()
-            return jsonify({"rounds": []})
-
-        session_ids = [s["session_id"] for s in sessions]
-
-        placeholders = ",".join(["?"] * len(session_ids))
-        cur.execute(
-            f"""
-            SELECT session_id, algorithm_name, duration_ms
-            FROM algorithm_runs
-            WHERE session_id IN ({placeholders})
-            """,
-            session_ids,
-        )
-        runs = cur.fetchall()
-        conn.close()
-
-        runs_map = {}
-        for r in runs:
-            sid = r["session_id"]
-            runs_map.setdefault(sid, {})
-            runs_map[sid][r["algorithm_name"]] = float(r["duration_ms"])
 
         rounds = []
-        for s in reversed(sessions):
-            sid = s["session_id"]
-            algo = runs_map.get(sid, {})
-
-            rounds.append(
-                {
-                    "sessionId": sid,
-                    "playerName": s["player_name"] if s["player_name"] else None,
-                    "homeCity": s["home_city"],
-                    "createdAt": s["created_at"],
-                    "bruteforce": algo.get("bruteforce"),
-                    "nearest_neighbor": algo.get("nearest_neighbor"),
-                    "mst_prim": algo.get("mst_prim"),
-                    "random_search": algo.get("random_search"),
-                }
-            )
+        for row in cur.fetchall():
+            rnd = {
+                "checkId": row["check_id"],
+                "sessionId": row["session_id"],
+                "cities": row["cities"],
+                "playerName": row["player_name"] if row["player_name"] else None,
+                "homeCity": row["home_city"],
+                "createdAt": row["created_at"],
+            }
+            for name in ALGORITHMS:
+                rnd[name] = row[name]
+            rounds.append(rnd)
 
-        return jsonify({"rounds": rounds})
+        return jsonify({"algorithms": list(ALGORITHMS), "rounds": rounds})
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def create_app():
+    # App factory for `python app.py` and WSGI servers ("app:create_app()").
+    # The brute-force pool is warmed here, once, so spawning its workers is
+    # never charged to a check request's ALGORITHM_BUDGET_MS.
+    init_db()
+    set_bruteforce_processes(BRUTEFORCE_PROCESSES)
+    warm_bruteforce_pool()
+    job_queue.start()
+    return app
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,322 @@
+# benchmark.py
+#
+# Offline benchmark of every engine registered in algorithms.ALGORITHMS.
+#
+#   python benchmark.py --out bench.json
+#   python benchmark.py --out bench.json --baseline baseline.json
+#   python benchmark.py --kinds '' --tsplib att48,gr17,eil51
+#
+# Instances are seeded: random matrices from generate_random_matrix and
+# Euclidean point sets. Exact sizes (k = kmin..kmax) are scored against the
+# Held-Karp optimum; larger heuristic-only sizes against the best tour any
+# engine found, and also against the Held-Karp lower bound, which caps the
+# true gap. --tsplib adds TSPLIB instances (vendored names or paths),
+# scored against their published optimum when known. With --baseline, the
+# exit status is 1 when a run got slower or further from the reference than
+# the baseline allows.
+import argparse
+import inspect
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import tsplib
+from algorithms import (
+    ALGORITHMS,
+    EuclideanInstance,
+    gap_pct,
+    generate_random_matrix,
+    held_karp_lower_bound,
+    lower_bound_or_none,
+    route_distance,
+    set_bruteforce_processes,
+    tsp_held_karp,
+)
+
+# engines that blow up combinatorially are only run up to this many cities
+EXACT_ENGINE_MAX_K = {"bruteforce": 11}
+
+DEFAULT_HEURISTIC_SIZES = (50, 200, 1000)
+
+
+def random_instance(k: int, seed: int) -> Tuple[int, List[int], List[List[int]]]:
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        matrix = generate_random_matrix(k + 1)
+    finally:
+        random.setstate(state)
+    return 0, list(range(1, k + 1)), matrix
+
+
+def euclidean_points(n: int, seed: int, size: float = 1000.0) -> List[Tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(n)]
+
+
+def euclidean_instance(k: int, seed: int) -> Tuple[int, List[int], EuclideanInstance]:
+    # distances are computed on demand, so large heuristic sizes stay cheap
+    return 0, list(range(1, k + 1)), EuclideanInstance(euclidean_points(k + 1, seed))
+
+
+INSTANCE_KINDS = {
+    "random": random_instance,
+    "euclidean": euclidean_instance,
+}
+
+
+def run_engine(
+    fn,
+    home: int,
+    selected: List[int],
+    matrix,
+    seed: int,
+    budget_ms: Optional[float],
+    measure_memory: bool = True,
+    repeats: int = 3,
+) -> Dict[str, Any]:
+    # time is the fastest of `repeats` runs; memory is the tracemalloc peak
+    # of one extra run, kept apart because tracing slows everything down
+    params = inspect.signature(fn).parameters
+    kwargs: Dict[str, Any] = {}
+    if "seed" in params:
+        kwargs["seed"] = seed
+
+    def call() -> Dict[str, Any]:
+        if budget_ms is not None and "deadline" in params:
+            kwargs["deadline"] = time.monotonic() + budget_ms / 1000.0
+        return fn(home, selected, matrix, **kwargs)
+
+    elapsed_ms = float("inf")
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        result = call()
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - start) * 1000.0)
+
+    peak_kib = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            call()
+            peak_kib = tracemalloc.get_traced_memory()[1] / 1024.0
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "timeMs": elapsed_ms,
+        "peakKiB": peak_kib,
+        "distance": int(result["distance"]),
+        "valid": sorted(result["route"][1:-1]) == sorted(selected)
+        and result["distance"] == route_distance(matrix, result["route"]),
+        "timedOut": bool(result.get("timedOut")),
+    }
+
+
+def _bench_instance(
+    name: str,
+    kind: str,
+    k: int,
+    instance: Tuple[int, List[int], List[List[int]]],
+    seed: int,
+    exact: bool,
+    engines: Dict[str, Any],
+    budget_ms: Optional[float],
+    measure_memory: bool,
+    repeats: int,
+    optimum: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    home, selected, matrix = instance
+    rows = []
+    for algo, fn in engines.items():
+        if k > EXACT_ENGINE_MAX_K.get(algo, k):
+            continue
+        row = {"instance": name, "kind": kind, "k": k, "algorithm": algo}
+        row.update(
+            run_engine(fn, home, selected, matrix, seed, budget_ms, measure_memory, repeats)
+        )
+        rows.append(row)
+
+    if optimum is not None:
+        reference, ref_kind = optimum, "optimum"
+    elif exact:
+        reference, ref_kind = tsp_held_karp(home, selected, matrix)["distance"], "optimum"
+    else:
+        reference, ref_kind = min(r["distance"] for r in rows), "best_known"
+
+    # without a known optimum the gap to the best tour found says nothing
+    # about the best tour itself; the Held-Karp bound caps every gap
+    bound = None
+    if ref_kind == "best_known":
+        deadline = None if budget_ms is None else time.monotonic() + budget_ms / 1000.0
+        bound = lower_bound_or_none(
+            held_karp_lower_bound(home, selected, matrix, upper=reference, deadline=deadline)
+        )
+    for row in rows:
+        row["reference"] = reference
+        row["referenceKind"] = ref_kind
+        row["gapPct"] = 100.0 * (row["distance"] - reference) / reference if reference else 0.0
+        row["lowerBound"] = bound
+        row["gapBoundPct"] = gap_pct(row["distance"], bound)
+    return rows
+
+
+def run_suite(
+    kmin: int = 5,
+    kmax: int = 20,
+    heuristic_sizes=DEFAULT_HEURISTIC_SIZES,
+    seed: int = 0,
+    budget_ms: Optional[float] = 10000.0,
+    algorithms: Optional[List[str]] = None,
+    kinds: Tuple[str, ...] = ("random", "euclidean"),
+    measure_memory: bool = True,
+    repeats: int = 3,
+    tsplib_instances: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
+    engines = {n: f for n, f in ALGORITHMS.items() if algorithms is None or n in algorithms}
+    heuristics = {n: f for n, f in engines.items() if n not in EXACT_ENGINE_MAX_K}
+
+    results: List[Dict[str, Any]] = []
+    for kind in kinds:
+        make = INSTANCE_KINDS[kind]
+        sizes = [(k, True) for k in range(kmin, kmax + 1)] + [(k, False) for k in heuristic_sizes]
+        for k, exact in sizes:
+            results += _bench_instance(
+                f"{kind}-k{k}-s{seed}",
+                kind,
+                k,
+                make(k, seed + k),
+                seed,
+                exact,
+                engines if exact else heuristics,
+                budget_ms,
+                measure_memory,
+                repeats,
+            )
+
+    for path in tsplib_instances:
+        instance = tsplib.load(tsplib.resolve(path))
+        home, selected, matrix = tsplib.as_problem(instance)
+        k = len(selected)
+        exact = k <= kmax
+        results += _bench_instance(
+            instance["name"],
+            "tsplib",
+            k,
+            (home, selected, matrix),
+            seed,
+            exact,
+            engines if exact else heuristics,
+            budget_ms,
+            measure_memory,
+            repeats,
+            optimum=instance["optimum"],
+        )
+
+    return {
+        "meta": {
+            "seed": seed,
+            "kmin": kmin,
+            "kmax": kmax,
+            "heuristicSizes": list(heuristic_sizes),
+            "tsplib": list(tsplib_instances),
+            "budgetMs": budget_ms,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_factor: float = 1.5,
+    min_time_delta_ms: float = 1.0,
+    gap_slack_pct: float = 1.0,
+) -> List[str]:
+    # a run regresses when it is both time_factor x and min_time_delta_ms
+    # slower than the baseline, or its gap grew by more than gap_slack_pct
+    before = {(r["instance"], r["algorithm"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for row in report["results"]:
+        old = before.get((row["instance"], row["algorithm"]))
+        if old is None:
+            continue
+        label = f"{row['algorithm']} on {row['instance']}"
+        if not row["valid"]:
+            regressions.append(f"{label}: invalid tour")
+        if (
+            row["timeMs"] > old["timeMs"] * time_factor
+            and row["timeMs"] - old["timeMs"] > min_time_delta_ms
+        ):
+            regressions.append(f"{label}: {old['timeMs']:.2f} ms -> {row['timeMs']:.2f} ms")
+        if row["gapPct"] > old["gapPct"] + gap_slack_pct:
+            regressions.append(f"{label}: gap {old['gapPct']:.2f}% -> {row['gapPct']:.2f}%")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the registered TSP engines.")
+    parser.add_argument("--out", default="-", help="JSON output file ('-' for stdout)")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--kmin", type=int, default=5)
+    parser.add_argument("--kmax", type=int, default=20)
+    parser.add_argument(
+        "--heuristic-sizes",
+        default=",".join(str(k) for k in DEFAULT_HEURISTIC_SIZES),
+        help="comma-separated city counts for heuristic-only instances",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=10000.0, help="per-run deadline")
+    parser.add_argument("--algorithms", help="comma-separated subset of engines")
+    parser.add_argument("--kinds", default="random,euclidean", help="'' to run only --tsplib")
+    parser.add_argument("--tsplib", default="", help="comma-separated TSPLIB instance names or paths")
+    parser.add_argument("--processes", type=int, default=1, help="brute-force worker processes (8+ cities)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per engine (fastest kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--time-factor", type=float, default=1.5)
+    parser.add_argument("--gap-slack", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    set_bruteforce_processes(args.processes)
+
+    report = run_suite(
+        kmin=args.kmin,
+        kmax=args.kmax,
+        heuristic_sizes=[int(k) for k in args.heuristic_sizes.split(",") if k],
+        seed=args.seed,
+        budget_ms=args.budget_ms,
+        algorithms=args.algorithms.split(",") if args.algorithms else None,
+        kinds=tuple(k for k in args.kinds.split(",") if k),
+        measure_memory=not args.no_memory,
+        repeats=args.repeats,
+        tsplib_instances=tuple(p for p in args.tsplib.split(",") if p),
+    )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(
+                report, json.load(f), args.time_factor, gap_slack_pct=args.gap_slack
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+
+    for line in report.get("regressions", []):
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
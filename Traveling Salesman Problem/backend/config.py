@@ -1,3 +1,34 @@
+import os
+
 DB_NAME = "tsp_game.db"
+# idle SQLite connections kept for request handlers
+DB_POOL_SIZE = 8
 
 CITIES = [chr(ord("A") + i) for i in range(10)]
+
+SESSION_CACHE_SIZE = 1024
+RESULT_CACHE_SIZE = 512
+
+# time budget for all engines and the lower bound in one check-answer, in
+# milliseconds
+ALGORITHM_BUDGET_MS = 1500
+
+# worker processes for brute force on 8+ cities (check-answer and jobs)
+BRUTEFORCE_PROCESSES = min(4, os.cpu_count() or 1)
+
+# anytime solver stream (/api/solve-stream)
+STREAM_DEFAULT_BUDGET_MS = 5000
+STREAM_MAX_BUDGET_MS = 60000
+STREAM_MAX_CITIES = 5000
+
+# background solve jobs (/api/jobs)
+JOB_WORKERS = 2
+JOB_QUEUE_SIZE = 16
+JOB_RESULT_TTL_S = 3600
+JOB_MAX_BUDGET_MS = 600000
+# engines that build a distance table are refused above this many cities;
+# bigger coordinate instances may only use the matrix-free engines. A dense
+# job peaks at roughly 45 bytes per city pair (about 320 MB at 2000 cities),
+# and JOB_WORKERS of them can run at once.
+JOB_MAX_DENSE_CITIES = 2000
+JOB_MAX_CITIES = 200000
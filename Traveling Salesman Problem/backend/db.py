@@ -1,13 +1,91 @@
+import queue
 import sqlite3
-from config import DB_NAME
+import threading
 
+from flask import g, has_app_context
 
-def get_db():
-    conn = sqlite3.connect(DB_NAME)
+from config import DB_NAME, DB_POOL_SIZE
+
+_local = threading.local()
+# idle connections for request handlers; Werkzeug serves every request on
+# a new thread, so a per-thread connection would never be reused there
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+
+
+def _connect():
+    conn = sqlite3.connect(DB_NAME, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+def get_db():
+    # Inside a request: a connection borrowed from the pool for the rest of
+    # the request and handed back by release_db. Elsewhere (job workers,
+    # scripts): one connection per thread. Callers commit but do not close.
+    if has_app_context():
+        conn = g.get("db")
+        if conn is None:
+            try:
+                conn = _pool.get_nowait()
+            except queue.Empty:
+                conn = _connect()
+            g.db = conn
+        return conn
+
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+
+def release_db(exc=None):
+    # app.teardown_appcontext hook
+    conn = g.pop("db", None)
+    if conn is None:
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    if _pool.qsize() < DB_POOL_SIZE:
+        _pool.put(conn)
+    else:
+        conn.close()
+
+
+def _add_check_ids(cur):
+    # Databases from before the checks table: add algorithm_runs.check_id
+    # and file the old runs under one check per (session, timestamp), the
+    # closest record there is of which runs came from the same check.
+    columns = {row["name"] for row in cur.execute("PRAGMA table_info(algorithm_runs)")}
+    if "check_id" in columns:
+        return
+    cur.execute("ALTER TABLE algorithm_runs ADD COLUMN check_id INTEGER REFERENCES checks(id)")
+    cur.execute(
+        """
+        INSERT INTO checks (session_id, player_id, created_at)
+        SELECT
+            r.session_id,
+            (SELECT g.player_id FROM games g WHERE g.session_id = r.session_id ORDER BY g.id DESC LIMIT 1),
+            r.created_at
+        FROM algorithm_runs r
+        JOIN sessions s ON s.id = r.session_id
+        GROUP BY r.session_id, r.created_at
+        ORDER BY MIN(r.id)
+        """
+    )
+    cur.execute(
+        """
+        UPDATE algorithm_runs SET check_id = (
+            SELECT c.id FROM checks c
+            WHERE c.session_id = algorithm_runs.session_id AND c.created_at = algorithm_runs.created_at
+        )
+        """
+    )
+
+
 def init_db():
     conn = get_db()
     cur = conn.cursor()
@@ -26,7 +104,7 @@ def init_db():
         CREATE TABLE IF NOT EXISTS sessions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             home_city TEXT NOT NULL,
-            distance_matrix TEXT NOT NULL,
+            distance_matrix BLOB NOT NULL,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
         );
         """
@@ -48,19 +126,62 @@ def init_db():
         """
     )
 
+    # one row per check-answer run of the engines; a session can be checked
+    # many times with different cities
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS checks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            player_id INTEGER,
+            cities INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(session_id) REFERENCES sessions(id),
+            FOREIGN KEY(player_id) REFERENCES players(id)
+        );
+        """
+    )
+
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS algorithm_runs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id INTEGER NOT NULL,
+            check_id INTEGER,
             algorithm_name TEXT NOT NULL,
             duration_ms REAL NOT NULL,
             distance INTEGER NOT NULL,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(session_id) REFERENCES sessions(id)
+            FOREIGN KEY(session_id) REFERENCES sessions(id),
+            FOREIGN KEY(check_id) REFERENCES checks(id)
         );
         """
     )
+    _add_check_ids(cur)
+
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            spec TEXT NOT NULL,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            started_at DATETIME,
+            finished_at DATETIME
+        );
+        """
+    )
+
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_algorithm_runs_session ON algorithm_runs (session_id, algorithm_name);"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_algorithm_runs_check ON algorithm_runs (check_id, algorithm_name);"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_games_session ON games (session_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at);")
 
     conn.commit()
-    conn.close()
@@ -0,0 +1,148 @@
+import json
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from db import get_db
+
+# runner(spec, progress) -> JSON-serialisable result; progress(info) may be
+# called any number of times with a JSON-serialisable dict
+Runner = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Any]
+
+
+class JobQueue:
+    """Long solves run on a fixed pool of worker threads, fed by a bounded
+    queue. Status, progress and results live in the jobs table, so any
+    process can answer a poll; finished jobs are deleted once they are
+    older than the TTL. When the queue is full, submit() refuses the job
+    instead of letting work pile up. Jobs a previous server left queued or
+    running are marked failed by start()."""
+
+    def __init__(self, runner: Runner, workers: int = 2, max_pending: int = 16, ttl_s: float = 3600.0):
+        self.runner = runner
+        self.workers = workers
+        self.ttl_s = ttl_s
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self) -> None:
+        with self._lock:
+            if not self._threads:
+                self.fail_abandoned()
+            while len(self._threads) < self.workers:
+                t = threading.Thread(
+                    target=self._work, name=f"tsp-job-{len(self._threads)}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, spec: Dict[str, Any]) -> Optional[str]:
+        # returns the new job id, or None when the queue is full
+        self.evict_expired()
+        job_id = uuid.uuid4().hex
+        conn = get_db()
+        conn.execute(
+            "INSERT INTO jobs (id, status, spec) VALUES (?, 'queued', ?)",
+            (job_id, json.dumps(spec)),
+        )
+        conn.commit()
+
+        try:
+            self._queue.put_nowait((job_id, spec))
+        except queue.Full:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.commit()
+            return None
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cur = get_db().cursor()
+        cur.execute(
+            """
+            SELECT id, status, progress, result, error, created_at, started_at, finished_at
+            FROM jobs WHERE id = ?
+            """,
+            (job_id,),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return {
+            "jobId": row["id"],
+            "status": row["status"],
+            "progress": json.loads(row["progress"]) if row["progress"] else None,
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "createdAt": row["created_at"],
+            "startedAt": row["started_at"],
+            "finishedAt": row["finished_at"],
+        }
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def evict_expired(self) -> int:
+        conn = get_db()
+        cur = conn.execute(
+            "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < datetime('now', ?)",
+            (f"-{int(self.ttl_s)} seconds",),
+        )
+        conn.commit()
+        return cur.rowcount
+
+    def fail_abandoned(self) -> int:
+        # Queued and running jobs live only in the memory of the process that
+        # took them, so after a restart they can never finish. Failing them
+        # ends the clients' polling and gives them a finished_at for the TTL.
+        conn = get_db()
+        cur = conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE status IN ('queued', 'running')
+            """,
+            ("The server restarted before the job finished",),
+        )
+        conn.commit()
+        return cur.rowcount
+
+    def _work(self) -> None:
+        while True:
+            job_id, spec = self._queue.get()
+            try:
+                self._run(job_id, spec)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id: str, spec: Dict[str, Any]) -> None:
+        conn = get_db()
+        conn.execute(
+            "UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (job_id,),
+        )
+        conn.commit()
+
+        def progress(info: Dict[str, Any]) -> None:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(info), job_id))
+            conn.commit()
+
+        try:
+            result = self.runner(spec, progress)
+        except Exception as e:
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                (str(e), job_id),
+            )
+        else:
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'done', result = ?, finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                (json.dumps(result), job_id),
+            )
+        conn.commit()
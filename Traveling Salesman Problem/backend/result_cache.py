@@ -0,0 +1,62 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from algorithms import CondensedMatrix
+
+
+def instance_key(home: int, selected: List[int], matrix) -> str:
+    # content address of a solve: the whole instance plus home and the
+    # selection as a set, so the order the player picked cities in is ignored
+    h = hashlib.sha256()
+    if isinstance(matrix, CondensedMatrix):
+        h.update(matrix.to_bytes())
+    else:
+        h.update(json.dumps([list(row) for row in matrix]).encode())
+    h.update(json.dumps([home, sorted(selected)]).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """LRU cache of run_algorithms results keyed by instance_key."""
+
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_for(self, home: int, selected: List[int], matrix) -> str:
+        return instance_key(home, selected, matrix)
+
+    def get(self, key: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry)
+
+    def put(self, key: str, results: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = copy.deepcopy(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+            }
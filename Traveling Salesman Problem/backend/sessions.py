@@ -0,0 +1,67 @@
+import struct
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from algorithms import CondensedMatrix
+from db import get_db
+
+
+class SessionStore:
+    """Game instances persisted in the sessions table, with an in-memory
+    LRU cache in front so check requests rarely touch SQLite."""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._cache: "OrderedDict[int, Tuple[str, CondensedMatrix]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, home_city: str, matrix: CondensedMatrix) -> int:
+        conn = get_db()
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO sessions (home_city, distance_matrix) VALUES (?, ?)",
+            (home_city, matrix.to_bytes()),
+        )
+        session_id = cur.lastrowid
+        conn.commit()
+
+        self._remember(session_id, (home_city, matrix))
+        return session_id
+
+    def get(self, session_id: int) -> Optional[Tuple[str, CondensedMatrix]]:
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None:
+                self._cache.move_to_end(session_id)
+                return entry
+
+        conn = get_db()
+        cur = conn.cursor()
+        # rows from before the binary format hold JSON text; they are treated
+        # as unknown sessions rather than decoded
+        cur.execute(
+            """
+            SELECT home_city, distance_matrix FROM sessions
+            WHERE id = ? AND typeof(distance_matrix) = 'blob'
+            """,
+            (session_id,),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        try:
+            matrix = CondensedMatrix.from_bytes(row["distance_matrix"])
+        except (struct.error, TypeError, ValueError, UnicodeDecodeError):
+            return None
+
+        entry = (row["home_city"], matrix)
+        self._remember(session_id, entry)
+        return entry
+
+    def _remember(self, session_id: int, entry: Tuple[str, CondensedMatrix]) -> None:
+        with self._lock:
+            self._cache[session_id] = entry
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
@@ -1,13 +1,30 @@
+import threading
+import time
 import unittest
+from itertools import permutations
 
-from app import (
+import algorithms
+from algorithms import (
+    _run_with_budget,
+    CondensedMatrix,
+    EuclideanInstance,
     generate_random_matrix,
     tsp_bruteforce,
     tsp_nearest_neighbor,
+    tsp_greedy_edge,
     tsp_random_search,
     tsp_mst_prim,
+    tsp_lin_kernighan,
+    tsp_christofides,
+    tsp_simulated_annealing,
+    tsp_genetic,
+    tsp_ant_colony,
+    tsp_held_karp,
+    held_karp_lower_bound,
     route_distance,
+    run_algorithms,
 )
+from result_cache import ResultCache
 
 
 class TestAlgorithms(unittest.TestCase):
@@ -25,6 +42,23 @@ class TestAlgorithms(unittest.TestCase):
                 else:
                     self.assertEqual(self.matrix[i][j], self.matrix[j][i])
 
+    def test_condensed_matrix_roundtrip(self):
+        condensed = CondensedMatrix.from_square(self.matrix)
+
+        self.assertEqual(condensed.tolist(), self.matrix)
+        self.assertEqual(CondensedMatrix.from_bytes(condensed.to_bytes()).tolist(), self.matrix)
+        for i in range(5):
+            for j in range(5):
+                self.assertEqual(condensed[i][j], self.matrix[i][j])
+
+    def test_engines_accept_condensed_matrix(self):
+        condensed = CondensedMatrix.from_square(self.matrix)
+        for fn in (tsp_bruteforce, tsp_nearest_neighbor, tsp_mst_prim, tsp_christofides):
+            self.assertEqual(
+                fn(self.home, self.selected, condensed),
+                fn(self.home, self.selected, self.matrix),
+            )
+
     def test_route_distance_calculation(self):
         route = [0, 1, 2, 3, 4, 0]
         dist = route_distance(self.matrix, route)
@@ -42,6 +76,103 @@ class TestAlgorithms(unittest.TestCase):
 
 
 
+    def test_bruteforce_matches_full_enumeration(self):
+        # low/high of 1..3 produces many ties, so this also pins tie-breaking
+        for _ in range(30):
+            matrix = generate_random_matrix(8, low=1, high=3)
+            selected = [5, 2, 7, 1, 6, 3]
+            expected_route, expected = None, float("inf")
+            for perm in permutations(selected):
+                route = [0] + list(perm) + [0]
+                d = route_distance(matrix, route)
+                if d < expected:
+                    expected_route, expected = route, d
+
+            res = tsp_bruteforce(0, selected, matrix)
+            self.assertEqual(res["route"], expected_route)
+            self.assertEqual(res["distance"], expected)
+
+    def test_held_karp_matches_bruteforce(self):
+        for _ in range(10):
+            matrix = generate_random_matrix(9)
+            selected = [1, 2, 3, 4, 5, 6, 7, 8]
+            exact = tsp_held_karp(0, selected, matrix)
+
+            self.assertEqual(exact["distance"], tsp_bruteforce(0, selected, matrix)["distance"])
+            self.assertEqual(exact["distance"], route_distance(matrix, exact["route"]))
+            self.assertEqual(sorted(exact["route"][1:-1]), selected)
+
+    def test_lower_bound_never_exceeds_optimum(self):
+        for _ in range(10):
+            matrix = generate_random_matrix(10)
+            selected = list(range(1, 10))
+            optimum = tsp_held_karp(0, selected, matrix)["distance"]
+            lb = held_karp_lower_bound(0, selected, matrix)
+
+            self.assertLessEqual(lb["bound"], optimum)
+            self.assertGreater(lb["bound"], 0.8 * optimum)
+            if lb["optimal"]:
+                self.assertEqual(lb["bound"], optimum)
+
+    def test_run_algorithms_reports_gap_to_lower_bound(self):
+        results = run_algorithms(self.home, self.selected, self.matrix)
+        bound = results["bruteforce"]["lowerBound"]
+
+        self.assertLessEqual(bound, results["bruteforce"]["distance"])
+        for res in results.values():
+            self.assertEqual(res["lowerBound"], bound)
+            self.assertGreaterEqual(res["gapPct"], 0.0)
+
+    def test_run_algorithms_drops_a_timed_out_bound(self):
+        matrix = CondensedMatrix.random(40, seed=7)
+        results = run_algorithms(0, list(range(1, 14)), matrix, budget_ms=100)
+
+        for res in results.values():
+            if res["lowerBound"] is None:
+                self.assertIsNone(res["gapPct"])
+            else:
+                self.assertLessEqual(res["lowerBound"], res["distance"])
+        self.assertTrue(any(res["timedOut"] for res in results.values()))
+        self.assertIsNone(results["bruteforce"]["lowerBound"])
+
+    def test_run_algorithms_marks_only_a_finished_bruteforce_exact(self):
+        matrix = CondensedMatrix.random(40, seed=7)
+        selected = list(range(1, 14))
+
+        timed_out = run_algorithms(0, selected, matrix, budget_ms=100)
+        self.assertTrue(timed_out["bruteforce"]["timedOut"])
+        self.assertFalse(timed_out["bruteforce"]["exact"])
+
+        finished = run_algorithms(0, selected[:6], matrix)
+        self.assertTrue(finished["bruteforce"]["exact"])
+        self.assertFalse(finished["nearest_neighbor"]["exact"])
+
+    def test_bruteforce_parallel_matches_serial(self):
+        matrix = generate_random_matrix(10, low=1, high=5)
+        selected = [3, 1, 4, 9, 5, 2, 6, 8]
+        serial = tsp_bruteforce(0, selected, matrix)
+        parallel = tsp_bruteforce(0, selected, matrix, processes=2)
+        pool = algorithms._bruteforce_pool
+
+        self.assertEqual(parallel, serial)
+        # the worker pool outlives the call and is reused by the next one
+        self.assertEqual(tsp_bruteforce(0, selected[::-1], matrix, processes=2)["distance"], serial["distance"])
+        self.assertIs(algorithms._bruteforce_pool, pool)
+
+    def test_warm_bruteforce_pool_starts_the_configured_pool(self):
+        algorithms.set_bruteforce_processes(2)
+        try:
+            algorithms.warm_bruteforce_pool()
+            pool = algorithms._bruteforce_pool
+            self.assertEqual(algorithms._bruteforce_pool_size, 2)
+
+            matrix = generate_random_matrix(10, low=1, high=5)
+            selected = [3, 1, 4, 9, 5, 2, 6, 8]
+            self.assertEqual(tsp_bruteforce(0, selected, matrix), tsp_bruteforce(0, selected, matrix, processes=1))
+            self.assertIs(algorithms._bruteforce_pool, pool)
+        finally:
+            algorithms.set_bruteforce_processes(1)
+
     def test_nearest_neighbor_valid(self):
         greedy = tsp_nearest_neighbor(self.home, self.selected, self.matrix)
 
@@ -56,6 +187,17 @@ class TestAlgorithms(unittest.TestCase):
         self.assertEqual(rnd["route"][-1], self.home)
         self.assertEqual(len(rnd["route"]), len(self.selected) + 2)
 
+    def test_random_search_time_budget(self):
+        matrix = generate_random_matrix(10)
+        selected = list(range(1, 10))
+        rnd = tsp_random_search(0, selected, matrix, iterations=None, time_budget_ms=20, seed=3)
+
+        self.assertEqual(sorted(rnd["route"][1:-1]), selected)
+        self.assertGreater(rnd["samples"], 0)
+        curve = [p["distance"] for p in rnd["convergence"]]
+        self.assertEqual(curve, sorted(curve, reverse=True))
+        self.assertEqual(curve[-1], rnd["distance"])
+
     def test_mst_prim_valid(self):
         mst = tsp_mst_prim(self.home, self.selected, self.matrix)
 
@@ -63,6 +205,88 @@ class TestAlgorithms(unittest.TestCase):
         self.assertEqual(mst["route"][-1], self.home)
         self.assertEqual(len(mst["route"]), len(self.selected) + 2)
 
+    def test_mst_prim_heap_variant_valid(self):
+        matrix = generate_random_matrix(40)
+        selected = list(range(1, 40))
+        dense = tsp_mst_prim(0, selected, matrix)
+        sparse = tsp_mst_prim(0, selected, matrix, use_heap=True, neighbours_k=39)
+
+        self.assertEqual(sorted(sparse["route"][1:-1]), selected)
+        self.assertEqual(sorted(dense["route"][1:-1]), selected)
+
+    def test_christofides_within_bound(self):
+        for _ in range(20):
+            matrix = generate_random_matrix(9)
+            selected = [1, 2, 3, 4, 5, 6, 7, 8]
+            brute = tsp_bruteforce(0, selected, matrix)
+            chris = tsp_christofides(0, selected, matrix)
+
+            self.assertEqual(chris["route"][0], 0)
+            self.assertEqual(chris["route"][-1], 0)
+            self.assertEqual(sorted(chris["route"][1:-1]), selected)
+            self.assertLessEqual(chris["distance"], 1.5 * brute["distance"])
+
+    def test_run_algorithms_result_cache(self):
+        cache = ResultCache(capacity=2)
+        first = run_algorithms(self.home, self.selected, self.matrix, cache=cache)
+        again = run_algorithms(self.home, list(reversed(self.selected)), self.matrix, cache=cache)
+
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertTrue(all(res["cached"] for res in again.values()))
+        self.assertEqual(again["bruteforce"]["route"], first["bruteforce"]["route"])
+
+        retimed = run_algorithms(self.home, self.selected, self.matrix, cache=cache, retime=True)
+        self.assertFalse(any(res.get("cached") for res in retimed.values()))
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_run_algorithms_budget_returns_best_so_far(self):
+        matrix = CondensedMatrix.random(40, seed=7)
+        selected = list(range(1, 14))
+        start = time.monotonic()
+        results = run_algorithms(0, selected, matrix, budget_ms=100)
+        elapsed_ms = (time.monotonic() - start) * 1000.0
+
+        # one budget for the whole call, not one per engine
+        self.assertLess(elapsed_ms, 1000)
+        brute = results["bruteforce"]
+        self.assertTrue(brute["timedOut"])
+        for res in results.values():
+            self.assertEqual(sorted(res["route"][1:-1]), selected)
+            self.assertEqual(res["distance"], route_distance(matrix, res["route"]))
+
+    def test_overrunning_engine_is_not_restarted(self):
+        matrix = CondensedMatrix.random(10, seed=1)
+        selected = list(range(1, 6))
+        release = threading.Event()
+        calls = []
+
+        def stuck(home, selected, matrix):
+            calls.append(1)
+            release.wait(5)
+            return tsp_nearest_neighbor(home, selected, matrix)
+
+        self.assertTrue(_run_with_budget(stuck, 0, selected, matrix, 10)["timedOut"])
+        self.assertTrue(_run_with_budget(stuck, 0, selected, matrix, 10)["timedOut"])
+        self.assertEqual(len(calls), 1)
+
+        release.set()
+        time.sleep(0.05)
+        self.assertFalse(_run_with_budget(stuck, 0, selected, matrix, 1000).get("timedOut"))
+        self.assertEqual(len(calls), 2)
+
+    def test_metaheuristics_valid_and_seeded(self):
+        matrix = generate_random_matrix(9)
+        selected = list(range(1, 9))
+        brute = tsp_bruteforce(0, selected, matrix)
+        for fn in (tsp_simulated_annealing, tsp_genetic, tsp_ant_colony):
+            res = fn(0, selected, matrix, seed=11)
+
+            self.assertEqual(res, fn(0, selected, matrix, seed=11))
+            self.assertEqual(sorted(res["route"][1:-1]), selected)
+            self.assertEqual(res["distance"], route_distance(matrix, res["route"]))
+            self.assertLessEqual(brute["distance"], res["distance"])
+
     def test_heuristics_not_better_than_bruteforce(self):
         brute = tsp_bruteforce(self.home, self.selected, self.matrix)
         greedy = tsp_nearest_neighbor(self.home, self.selected, self.matrix)
@@ -73,6 +297,90 @@ class TestAlgorithms(unittest.TestCase):
         self.assertLessEqual(brute["distance"], rnd["distance"])
         self.assertLessEqual(brute["distance"], mst["distance"])
 
+    def test_lin_kernighan_valid(self):
+        lk = tsp_lin_kernighan(self.home, self.selected, self.matrix)
+
+        self.assertEqual(lk["route"][0], self.home)
+        self.assertEqual(lk["route"][-1], self.home)
+        self.assertEqual(sorted(lk["route"][1:-1]), sorted(self.selected))
+        self.assertEqual(lk["distance"], route_distance(self.matrix, lk["route"]))
+
+    def test_lin_kernighan_large_instance(self):
+        matrix = generate_random_matrix(300)
+        selected = list(range(1, 300))
+        lk = tsp_lin_kernighan(0, selected, matrix, seed=1)
+        greedy = tsp_nearest_neighbor(0, selected, matrix)
+
+        self.assertEqual(sorted(lk["route"][1:-1]), selected)
+        self.assertLessEqual(lk["distance"], greedy["distance"])
+
+    def test_euclidean_instance_distances(self):
+        inst = EuclideanInstance([(0, 0), (3, 4), (6, 8), (1, 1)])
+        dense = inst.tolist()
+
+        self.assertEqual(inst[0][1], 5)
+        self.assertEqual(inst[1][2], 5)
+        self.assertEqual([[inst[i][j] for j in range(4)] for i in range(4)], dense)
+
+    def test_kd_tree_nearest_matches_scan(self):
+        inst = EuclideanInstance.random(200, seed=3)
+        tree = inst.tree(list(range(200)))
+        removed = set(range(0, 200, 3))
+        for p in removed:
+            tree.remove(p)
+
+        def sq(i, j):
+            return (inst.xs[i] - inst.xs[j]) ** 2 + (inst.ys[i] - inst.ys[j]) ** 2
+
+        for q in range(0, 200, 7):
+            live = [j for j in range(200) if j not in removed]
+            self.assertEqual(tree.nearest_to(q), min(live, key=lambda j: sq(q, j)))
+        knn = tree.k_nearest_all(4)
+        for q in range(0, 200, 7):
+            others = sorted((j for j in range(200) if j != q), key=lambda j: sq(q, j))
+            self.assertEqual(knn[q].tolist(), others[:4])
+
+    def test_instance_neighbour_lists(self):
+        cm = CondensedMatrix.random(60, low=1, high=10000, seed=6)
+        full = cm.tolist()
+        nearest = cm.neighbours(5)
+
+        for i in range(60):
+            expected = sorted((j for j in range(60) if j != i), key=lambda j: (full[i][j], j))[:5]
+            self.assertEqual(nearest[i].tolist(), expected)
+        self.assertIs(cm.neighbours(3).base, cm.neighbours(5).base)
+
+        inst = EuclideanInstance.random(60, seed=6)
+        tree_lists = inst.tree(list(range(60))).k_nearest_all(4)
+        self.assertEqual(inst.neighbours(4).tolist(), tree_lists.tolist())
+
+    def test_engines_accept_shared_neighbour_lists(self):
+        cm = CondensedMatrix.random(40, seed=7)
+        selected = list(range(1, 40))
+        for fn in (tsp_nearest_neighbor, tsp_lin_kernighan, tsp_ant_colony, tsp_greedy_edge):
+            tour = fn(0, selected, cm)
+
+            self.assertEqual(sorted(tour["route"][1:-1]), selected)
+            self.assertEqual(tour["distance"], route_distance(cm, tour["route"]))
+
+    def test_greedy_edge_valid(self):
+        selected = list(range(1, 60))
+        for matrix in (generate_random_matrix(60), EuclideanInstance.random(60, seed=4)):
+            tour = tsp_greedy_edge(0, selected, matrix)
+
+            self.assertEqual(tour["route"][0], 0)
+            self.assertEqual(tour["route"][-1], 0)
+            self.assertEqual(sorted(tour["route"][1:-1]), selected)
+            self.assertEqual(tour["distance"], route_distance(matrix, tour["route"]))
+
+    def test_euclidean_nearest_neighbor_valid(self):
+        inst = EuclideanInstance.random(80, seed=5)
+        selected = list(range(1, 80, 2))
+        nn = tsp_nearest_neighbor(0, selected, inst)
+
+        self.assertEqual(sorted(nn["route"][1:-1]), sorted(selected))
+        self.assertEqual(nn["distance"], route_distance(inst.tolist(), nn["route"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from benchmark import compare, run_suite
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_suite_reports_gap_to_optimum(self):
+        report = run_suite(
+            kmin=5,
+            kmax=6,
+            heuristic_sizes=(12,),
+            algorithms=["bruteforce", "nearest_neighbor", "christofides"],
+            measure_memory=False,
+            repeats=1,
+        )
+        rows = report["results"]
+
+        self.assertTrue(all(r["valid"] for r in rows))
+        for r in rows:
+            if r["algorithm"] == "bruteforce":
+                self.assertEqual(r["gapPct"], 0.0)
+            self.assertGreaterEqual(r["gapPct"], 0.0)
+        self.assertEqual({r["referenceKind"] for r in rows if r["k"] == 12}, {"best_known"})
+        for r in rows:
+            if r["k"] == 12:
+                self.assertLessEqual(r["lowerBound"], r["reference"])
+                self.assertGreaterEqual(r["gapBoundPct"], r["gapPct"])
+        self.assertNotIn("bruteforce", {r["algorithm"] for r in rows if r["k"] == 12})
+
+    def test_suite_runs_tsplib_instances(self):
+        report = run_suite(
+            kmax=5,
+            kinds=(),
+            algorithms=["nearest_neighbor", "lin_kernighan"],
+            measure_memory=False,
+            repeats=1,
+            tsplib_instances=("burma14",),
+        )
+        rows = report["results"]
+
+        self.assertEqual({r["instance"] for r in rows}, {"burma14"})
+        self.assertEqual({r["reference"] for r in rows}, {3323})
+        self.assertTrue(all(r["valid"] and r["gapPct"] >= 0.0 for r in rows))
+
+    def test_compare_flags_regressions(self):
+        row = {"instance": "random-k5-s0", "algorithm": "mst_prim", "valid": True}
+        baseline = {"results": [dict(row, timeMs=10.0, gapPct=2.0)]}
+
+        self.assertEqual(compare({"results": [dict(row, timeMs=11.0, gapPct=2.5)]}, baseline), [])
+        self.assertEqual(len(compare({"results": [dict(row, timeMs=30.0, gapPct=2.0)]}, baseline)), 1)
+        self.assertEqual(len(compare({"results": [dict(row, timeMs=10.0, gapPct=5.0)]}, baseline)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from flask import Flask
+
+import db
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self._db_name = db.DB_NAME
+        db.DB_NAME = os.path.join(tmp.name, "pool.db")
+        db._local.conn = None
+        self.app = Flask(__name__)
+        self.app.teardown_appcontext(db.release_db)
+
+    def tearDown(self):
+        while not db._pool.empty():
+            db._pool.get_nowait().close()
+        db.DB_NAME = self._db_name
+
+    def test_requests_on_new_threads_reuse_a_connection(self):
+        seen = []
+
+        def request():
+            with self.app.app_context():
+                seen.append(db.get_db())
+
+        for _ in range(3):
+            t = threading.Thread(target=request)
+            t.start()
+            t.join()
+        self.assertEqual(len(set(map(id, seen))), 1)
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        with self.app.app_context():
+            conn = db.get_db()
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with self.app.app_context():
+            self.assertEqual(db.get_db().execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+
+class TestCheckIdMigration(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self._db_name = db.DB_NAME
+        db.DB_NAME = os.path.join(tmp.name, "old.db")
+        db._local.conn = None
+
+    def tearDown(self):
+        db._local.conn.close()
+        db._local.conn = None
+        db.DB_NAME = self._db_name
+
+    def test_old_runs_are_filed_under_one_check_per_timestamp(self):
+        conn = db.get_db()
+        conn.executescript(
+            """
+            CREATE TABLE sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                home_city TEXT NOT NULL,
+                distance_matrix BLOB NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE algorithm_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER NOT NULL,
+                algorithm_name TEXT NOT NULL,
+                duration_ms REAL NOT NULL,
+                distance INTEGER NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO sessions (home_city, distance_matrix) VALUES ('A', x'00');
+            INSERT INTO algorithm_runs (session_id, algorithm_name, duration_ms, distance, created_at)
+            VALUES (1, 'bruteforce', 229.0, 10, '2024-01-01 10:00:00'),
+                   (1, 'greedy_edge', 1.0, 11, '2024-01-01 10:00:00'),
+                   (1, 'bruteforce', 2.0, 7, '2024-01-01 10:05:00'),
+                   (1, 'greedy_edge', 15.3, 7, '2024-01-01 10:05:00');
+            """
+        )
+        db.init_db()
+        db.init_db()  # a second start-up changes nothing
+
+        checks = conn.execute(
+            "SELECT check_id, GROUP_CONCAT(duration_ms) AS ms FROM algorithm_runs GROUP BY check_id ORDER BY check_id"
+        ).fetchall()
+        self.assertEqual([(r["check_id"], r["ms"]) for r in checks], [(1, "229.0,1.0"), (2, "2.0,15.3")])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM checks").fetchone()[0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import db
+from jobs import JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self._db_name = db.DB_NAME
+        db.DB_NAME = os.path.join(tmp.name, "jobs.db")
+        db._local.conn = None
+        db.init_db()
+
+    def tearDown(self):
+        db.get_db().close()
+        db._local.conn = None
+        db.DB_NAME = self._db_name
+
+    def wait(self, jobs, job_id):
+        for _ in range(200):
+            job = jobs.get(job_id)
+            if job["status"] in ("done", "failed"):
+                return job
+            time.sleep(0.01)
+        self.fail("job did not finish")
+
+    def test_runs_job_and_reports_progress(self):
+        def runner(spec, progress):
+            progress({"done": 1, "total": 2})
+            return {"sum": sum(spec["values"])}
+
+        jobs = JobQueue(runner, workers=1)
+        jobs.start()
+        job = self.wait(jobs, jobs.submit({"values": [1, 2, 3]}))
+
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["result"], {"sum": 6})
+        self.assertEqual(job["progress"], {"done": 1, "total": 2})
+        self.assertIsNotNone(job["finishedAt"])
+
+    def test_failed_job_keeps_error(self):
+        def runner(spec, progress):
+            raise ValueError("bad instance")
+
+        jobs = JobQueue(runner, workers=1)
+        jobs.start()
+        job = self.wait(jobs, jobs.submit({}))
+
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "bad instance")
+
+    def test_full_queue_refuses_jobs(self):
+        release = threading.Event()
+
+        def runner(spec, progress):
+            release.wait(5)
+            return None
+
+        jobs = JobQueue(runner, workers=1, max_pending=2)
+        jobs.start()
+        first = jobs.submit({})
+        for _ in range(100):
+            if jobs.get(first)["status"] == "running":
+                break
+            time.sleep(0.01)
+        accepted = [jobs.submit({}) for _ in range(3)]
+        release.set()
+
+        self.assertIsNotNone(accepted[0])
+        self.assertIsNotNone(accepted[1])
+        self.assertIsNone(accepted[2])
+
+    def test_expired_results_are_evicted(self):
+        jobs = JobQueue(lambda spec, progress: 1, workers=1, ttl_s=60)
+        jobs.start()
+        job_id = jobs.submit({})
+        self.wait(jobs, job_id)
+        conn = db.get_db()
+        conn.execute("UPDATE jobs SET finished_at = datetime('now', '-2 minutes') WHERE id = ?", (job_id,))
+        conn.commit()
+
+        self.assertEqual(jobs.evict_expired(), 1)
+        self.assertIsNone(jobs.get(job_id))
+
+    def test_start_fails_jobs_left_by_a_restart(self):
+        conn = db.get_db()
+        conn.executemany(
+            "INSERT INTO jobs (id, status, spec) VALUES (?, ?, '{}')",
+            [("queued", "queued"), ("running", "running")],
+        )
+        conn.commit()
+
+        jobs = JobQueue(lambda spec, progress: 1, workers=1)
+        jobs.start()
+        for job_id in ("queued", "running"):
+            job = jobs.get(job_id)
+            self.assertEqual(job["status"], "failed")
+            self.assertIsNotNone(job["finishedAt"])
+
+        # jobs submitted after the start are not touched by a second start()
+        job_id = jobs.submit({})
+        jobs.start()
+        self.assertEqual(self.wait(jobs, job_id)["status"], "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
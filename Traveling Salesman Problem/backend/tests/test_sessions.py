@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+import db
+from algorithms import CondensedMatrix
+from sessions import SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self._db_name = db.DB_NAME
+        db.DB_NAME = os.path.join(tmp.name, "sessions.db")
+        db._local.conn = None
+        db.init_db()
+
+    def tearDown(self):
+        db.get_db().close()
+        db._local.conn = None
+        db.DB_NAME = self._db_name
+
+    def insert(self, blob):
+        conn = db.get_db()
+        cur = conn.execute(
+            "INSERT INTO sessions (home_city, distance_matrix) VALUES ('A', ?)", (blob,)
+        )
+        conn.commit()
+        return cur.lastrowid
+
+    def test_round_trip_through_sqlite(self):
+        matrix = CondensedMatrix.random(6, seed=3)
+        session_id = SessionStore().create("B", matrix)
+
+        home, loaded = SessionStore().get(session_id)
+        self.assertEqual(home, "B")
+        self.assertEqual(loaded.tolist(), matrix.tolist())
+
+    def test_legacy_and_corrupt_rows_are_unknown(self):
+        store = SessionStore()
+        legacy = self.insert("[[0, 1], [1, 0]]")
+        truncated = self.insert(CondensedMatrix.random(6, seed=3).to_bytes()[:-3])
+        garbage = self.insert(b"\x05\x00\x00\x00zzz")
+
+        for session_id in (legacy, truncated, garbage):
+            self.assertIsNone(store.get(session_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
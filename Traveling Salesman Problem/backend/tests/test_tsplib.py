@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from algorithms import CondensedMatrix, EuclideanInstance, tsp_held_karp
+from tsplib import INSTANCE_DIR, as_problem, load, resolve, vendored
+
+FULL = [
+    [0, 3, 4, 2],
+    [3, 0, 5, 7],
+    [4, 5, 0, 6],
+    [2, 7, 6, 0],
+]
+
+EXPLICIT_BODIES = {
+    "FULL_MATRIX": "0 3 4 2\n3 0 5 7\n4 5 0 6\n2 7 6 0",
+    "UPPER_ROW": "3 4 2\n5 7\n6",
+    "LOWER_ROW": "3\n4 5\n2 7 6",
+    "UPPER_DIAG_ROW": "0 3 4 2\n0 5 7\n0 6\n0",
+    "LOWER_DIAG_ROW": "0\n3 0\n4 5 0\n2 7 6 0",
+}
+
+
+class TestTsplib(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def explicit(self, fmt):
+        return self.write(
+            f"t{fmt.lower()}.tsp",
+            f"NAME: t\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+            f"EDGE_WEIGHT_FORMAT: {fmt}\nEDGE_WEIGHT_SECTION\n{EXPLICIT_BODIES[fmt]}\nEOF\n",
+        )
+
+    def test_explicit_formats_agree(self):
+        for fmt in EXPLICIT_BODIES:
+            instance = load(self.explicit(fmt), use_cache=False)
+
+            self.assertIsInstance(instance["matrix"], CondensedMatrix)
+            self.assertEqual(instance["matrix"].tolist(), FULL, fmt)
+
+    def test_explicit_matrix_is_memory_mapped_from_cache(self):
+        path = self.explicit("UPPER_ROW")
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        first = load(path, cache_dir=cache_dir)
+        second = load(path, cache_dir=cache_dir)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertIsInstance(second["matrix"].data, np.memmap)
+        self.assertEqual(second["matrix"].tolist(), FULL)
+
+    def test_coordinate_types(self):
+        body = "NODE_COORD_SECTION\n1 0 0\n2 3 4\n3 0 10\nEOF\n"
+        euc = load(self.write("e.tsp", "NAME: e\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\n" + body))
+        att = load(self.write("a.tsp", "NAME: a\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: ATT\n" + body))
+
+        self.assertIsInstance(euc["matrix"], EuclideanInstance)
+        self.assertEqual(euc["matrix"].tolist(), [[0, 5, 10], [5, 0, 7], [10, 7, 0]])
+        # ATT: r = sqrt(25 / 10) = 1.58 rounds to 2; sqrt(100 / 10) = 3.16 -> 3, bumped to 4
+        self.assertEqual(att["matrix"][0][1], 2)
+        self.assertEqual(att["matrix"][0][2], 4)
+
+    def test_vendored_instances_reach_published_optimum(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        for name in ("burma14", "ulysses16", "gr17"):
+            instance = load(resolve(name), cache_dir=cache_dir)
+            home, selected, matrix = as_problem(instance)
+
+            self.assertEqual(
+                tsp_held_karp(home, selected, matrix)["distance"], instance["optimum"], name
+            )
+
+    def test_rejects_unsupported_types(self):
+        path = self.write("x.tsp", "NAME: x\nTYPE: ATSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EXPLICIT\nEOF\n")
+
+        with self.assertRaises(ValueError):
+            load(path, use_cache=False)
+
+    def test_vendored_only_names_bundled_instances(self):
+        self.assertEqual(vendored("att48"), os.path.join(INSTANCE_DIR, "att48.tsp"))
+        for name in ("/etc/hostname", "../instances/att48", "..", "att48.tsp", "nope", ""):
+            with self.assertRaises(FileNotFoundError):
+                vendored(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
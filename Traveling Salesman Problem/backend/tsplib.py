@@ -0,0 +1,298 @@
+# tsplib.py
+#
+# Loader for TSPLIB instance files, so the engines in algorithms.py can be
+# run on standard benchmarks (a few are vendored in instances/).
+#
+#   python tsplib.py instances/att48.tsp
+#   python tsplib.py instances/gr17.tsp --algorithms bruteforce,lin_kernighan
+#
+# Coordinate types (EUC_2D, CEIL_2D, ATT) load as an EuclideanInstance with
+# distances computed on demand. GEO and EXPLICIT instances become a
+# CondensedMatrix, which is written once to a binary cache file and memory
+# mapped on every later load, so a big matrix is neither re-parsed nor copied.
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from algorithms import ALGORITHMS, CondensedMatrix, EuclideanInstance, set_bruteforce_processes
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instances")
+
+# published optimal tour lengths of the vendored instances
+KNOWN_OPTIMA = {
+    "att48": 10628,
+    "burma14": 3323,
+    "eil51": 426,
+    "gr17": 2085,
+    "ulysses16": 6859,
+}
+
+COORD_METRICS = {"EUC_2D": "euc_2d", "CEIL_2D": "ceil_2d", "ATT": "att"}
+
+# EXPLICIT formats of a symmetric matrix, as (upper triangle?, with diagonal?).
+# Reading a lower triangle by rows visits the same cells as reading the upper
+# triangle by columns, and vice versa.
+EXPLICIT_FORMATS = {
+    "UPPER_ROW": (True, False),
+    "LOWER_COL": (True, False),
+    "UPPER_DIAG_ROW": (True, True),
+    "LOWER_DIAG_COL": (True, True),
+    "LOWER_ROW": (False, False),
+    "UPPER_COL": (False, False),
+    "LOWER_DIAG_ROW": (False, True),
+    "UPPER_DIAG_COL": (False, True),
+}
+
+SECTIONS = (
+    "NODE_COORD_SECTION",
+    "EDGE_WEIGHT_SECTION",
+    "DISPLAY_DATA_SECTION",
+    "TOUR_SECTION",
+    "FIXED_EDGES_SECTION",
+    "DEPOT_SECTION",
+    "DEMAND_SECTION",
+)
+
+
+def parse(text: str) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    # "KEY : VALUE" header lines, then sections of whitespace-separated tokens
+    spec: Dict[str, str] = {}
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        word = line.split(":", 1)[0].split()[0].upper()
+        if word == "EOF":
+            break
+        if word in SECTIONS:
+            current = sections.setdefault(word, [])
+        elif ":" in line and (current is None or not _is_number(word)):
+            key, value = line.split(":", 1)
+            spec[key.strip().upper()] = value.strip()
+            current = None
+        elif current is not None:
+            current.append(line)
+        else:
+            raise ValueError(f"unexpected line outside any section: {line!r}")
+    return spec, sections
+
+
+def _is_number(token: str) -> bool:
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _tokens(lines: List[str]) -> "np.ndarray":
+    return np.array(" ".join(lines).split(), dtype=np.float64)
+
+
+def _coordinates(lines: List[str], n: int) -> "np.ndarray":
+    values = _tokens(lines)
+    if len(values) != 3 * n:
+        raise ValueError(f"NODE_COORD_SECTION must hold {n} 2-D nodes")
+    rows = values.reshape(n, 3)
+    return rows[np.argsort(rows[:, 0], kind="stable"), 1:]
+
+
+def _geo_matrix(xy: "np.ndarray") -> CondensedMatrix:
+    # TSPLIB GEO: DDD.MM degrees/minutes to radians, then great-circle
+    # kilometres on the TSPLIB sphere, truncated as the reference code does
+    deg = np.trunc(xy)
+    rad = 3.141592 * (deg + 5.0 * (xy - deg) / 3.0) / 180.0
+    lat, lon = rad[:, 0], rad[:, 1]
+    n = len(xy)
+    i, j = np.triu_indices(n, 1)
+    q1 = np.cos(lon[i] - lon[j])
+    q2 = np.cos(lat[i] - lat[j])
+    q3 = np.cos(lat[i] + lat[j])
+    arc = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+    return CondensedMatrix(n, _compact((6378.388 * arc + 1.0).astype(np.int64)))
+
+
+def _explicit_matrix(spec: Dict[str, str], lines: List[str], n: int) -> CondensedMatrix:
+    fmt = spec.get("EDGE_WEIGHT_FORMAT", "").upper()
+    values = _tokens(lines)
+    if fmt == "FULL_MATRIX":
+        if len(values) != n * n:
+            raise ValueError(f"FULL_MATRIX must hold {n * n} weights")
+        return CondensedMatrix(n, _compact(values.reshape(n, n)[np.triu_indices(n, 1)]))
+    if fmt not in EXPLICIT_FORMATS:
+        raise ValueError(f"unsupported EDGE_WEIGHT_FORMAT {fmt!r}")
+
+    upper, diag = EXPLICIT_FORMATS[fmt]
+    expected = n * (n + 1) // 2 if diag else n * (n - 1) // 2
+    if len(values) != expected:
+        raise ValueError(f"{fmt} must hold {expected} weights")
+    if upper:
+        i, j = np.triu_indices(n, 0 if diag else 1)
+    else:
+        i, j = np.tril_indices(n, 0 if diag else -1)
+    keep = i != j
+    a, b = np.minimum(i[keep], j[keep]), np.maximum(i[keep], j[keep])
+    data = np.empty(n * (n - 1) // 2, dtype=np.float64)
+    data[n * a - a * (a + 1) // 2 + (b - a - 1)] = values[keep]
+    return CondensedMatrix(n, _compact(data))
+
+
+def _compact(data: "np.ndarray") -> "np.ndarray":
+    data = data.astype(np.int64)
+    if len(data) == 0 or (data.min() >= 0 and data.max() < 2 ** 16):
+        return data.astype(np.uint16)
+    return data
+
+
+def _cache_path(path: str, cache_dir: str) -> str:
+    # keyed on size and mtime, so an edited source file is parsed again
+    st = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-{st.st_size}-{st.st_mtime_ns}.cmat")
+
+
+def load(path: str, cache_dir: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+    # Returns {"name", "comment", "dimension", "edgeWeightType", "matrix",
+    # "optimum", "cached"}; "matrix" is ready for any engine, "optimum" is
+    # the published tour length when known and "cached" tells whether the
+    # matrix was memory mapped from an earlier load.
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), ".cache")
+    cache_file = _cache_path(path, cache_dir) if use_cache else None
+
+    have_cache = cache_file is not None and os.path.exists(cache_file)
+    with open(path) as f:
+        spec, sections = _header(f) if have_cache else parse(f.read())
+
+    problem_type = spec.get("TYPE", "TSP").upper()
+    if problem_type != "TSP":
+        raise ValueError(f"only symmetric TSP instances are supported, not {problem_type}")
+    n = int(spec["DIMENSION"])
+    weight_type = spec.get("EDGE_WEIGHT_TYPE", "").upper()
+    name = spec.get("NAME", "").strip() or os.path.basename(path)
+    name = name[:-4] if name.endswith(".tsp") else name
+
+    cached = False
+    if weight_type in COORD_METRICS:
+        matrix = EuclideanInstance(
+            _coordinates(sections.get("NODE_COORD_SECTION", []), n), COORD_METRICS[weight_type]
+        )
+    elif weight_type in ("GEO", "EXPLICIT"):
+        if have_cache:
+            matrix, cached = CondensedMatrix.mmap(cache_file), True
+        else:
+            if weight_type == "GEO":
+                matrix = _geo_matrix(_coordinates(sections.get("NODE_COORD_SECTION", []), n))
+            else:
+                matrix = _explicit_matrix(spec, sections.get("EDGE_WEIGHT_SECTION", []), n)
+            if cache_file is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{cache_file}.{os.getpid()}.tmp"
+                matrix.save(tmp)
+                os.replace(tmp, cache_file)
+                matrix = CondensedMatrix.mmap(cache_file)
+    else:
+        raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {weight_type!r}")
+
+    return {
+        "name": name,
+        "comment": spec.get("COMMENT", ""),
+        "dimension": n,
+        "edgeWeightType": weight_type,
+        "matrix": matrix,
+        "optimum": KNOWN_OPTIMA.get(name),
+        "cached": cached,
+    }
+
+
+def _header(f) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    # with a cached matrix only the specification part has to be read
+    lines = []
+    for line in f:
+        word = line.strip().split(":", 1)[0].strip().upper()
+        if word in SECTIONS or word == "EOF":
+            break
+        lines.append(line)
+    return parse("".join(lines))
+
+
+def as_problem(instance: Dict[str, Any]) -> Tuple[int, List[int], Any]:
+    # TSPLIB tours visit every node; city 0 plays the home city
+    n = instance["dimension"]
+    return 0, list(range(1, n)), instance["matrix"]
+
+
+def resolve(path_or_name: str) -> str:
+    # "att48" finds instances/att48.tsp; anything else is taken as a path
+    if os.path.exists(path_or_name):
+        return path_or_name
+    vendored = os.path.join(INSTANCE_DIR, path_or_name + ".tsp")
+    if os.path.exists(vendored):
+        return vendored
+    raise FileNotFoundError(f"no TSPLIB instance {path_or_name!r}")
+
+
+def vendored(name: str) -> str:
+    # path of a vendored instance by bare name; unlike resolve() this never
+    # reaches outside INSTANCE_DIR, so it is safe for names from clients
+    if not name or "/" in name or "\\" in name or name.startswith("."):
+        raise FileNotFoundError(f"no vendored TSPLIB instance {name!r}")
+    path = os.path.join(INSTANCE_DIR, name + ".tsp")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"no vendored TSPLIB instance {name!r}")
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # imported here because benchmark.py itself loads instances through us
+    from benchmark import EXACT_ENGINE_MAX_K, run_engine
+
+    parser = argparse.ArgumentParser(description="Solve a TSPLIB instance with the registered engines.")
+    parser.add_argument("instance", help="path to a .tsp file, or the name of a vendored instance")
+    parser.add_argument("--algorithms", help="comma-separated subset of engines")
+    parser.add_argument("--budget-ms", type=float, default=10000.0, help="per-engine deadline")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=1, help="brute-force worker processes (8+ cities)")
+    parser.add_argument("--no-cache", action="store_true", help="parse the file even if a cached matrix exists")
+    args = parser.parse_args(argv)
+    set_bruteforce_processes(args.processes)
+
+    instance = load(resolve(args.instance), use_cache=not args.no_cache)
+    home, selected, matrix = as_problem(instance)
+    if args.algorithms:
+        names = args.algorithms.split(",")
+        unknown = [a for a in names if a not in ALGORITHMS]
+        if unknown:
+            parser.error(f"unknown algorithms: {', '.join(unknown)}")
+    else:
+        k = len(selected)
+        names = [a for a in ALGORITHMS if k <= EXACT_ENGINE_MAX_K.get(a, k)]
+
+    optimum = instance["optimum"]
+    results = []
+    for name in names:
+        row = {"algorithm": name}
+        row.update(
+            run_engine(ALGORITHMS[name], home, selected, matrix, args.seed, args.budget_ms, False, 1)
+        )
+        row["gapPct"] = 100.0 * (row["distance"] - optimum) / optimum if optimum else None
+        results.append(row)
+
+    report = {
+        "instance": instance["name"],
+        "dimension": instance["dimension"],
+        "edgeWeightType": instance["edgeWeightType"],
+        "optimum": optimum,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,18 @@ const ALGO_COLORS = {
   nearest_neighbor: '#2563eb', // blue
   mst_prim: '#16a34a', // green
   random_search: '#f59e0b', // orange
+  greedy_edge: '#0891b2', // cyan
+  lin_kernighan: '#7c3aed', // violet
+  christofides: '#db2777', // pink
+  simulated_annealing: '#65a30d', // lime
+  genetic: '#ea580c', // deep orange
+  ant_colony: '#854d0e', // brown
+}
+// engines without a fixed colour (added on the backend later) cycle these
+const EXTRA_COLORS = ['#0f766e', '#9333ea', '#be123c', '#4d7c0f', '#1d4ed8', '#a16207']
+
+function algoColor(name, index) {
+  return ALGO_COLORS[name] ?? EXTRA_COLORS[index % EXTRA_COLORS.length]
 }
 
 
@@ -108,6 +120,7 @@ function CityMap({ cities, homeCity, routeBetween, distanceMatrix, positions })
 
 function PerformanceChart() {
   const [data, setData] = useState([])
+  const [algos, setAlgos] = useState([])
   const [loading, setLoading] = useState(false)
   const [err, setErr] = useState(null)
 
@@ -121,16 +134,15 @@ function PerformanceChart() {
       const json = await res.json()
       if (!res.ok) throw new Error(json.error || 'Failed to load performance')
 
-      const rounds = (json.rounds || []).map((r) => ({
-        ...r,
-        roundLabel: `#${r.sessionId}`,
-        playerName: r.playerName ?? null,
-        bruteforce: toSafeMs(r.bruteforce),
-        nearest_neighbor: toSafeMs(r.nearest_neighbor),
-        mst_prim: toSafeMs(r.mst_prim),
-        random_search: toSafeMs(r.random_search),
-      }))
+      // one series and one column per engine the backend reports
+      const names = json.algorithms || []
+      const rounds = (json.rounds || []).map((r) => {
+        const row = { ...r, roundLabel: `#${r.checkId}`, playerName: r.playerName ?? null }
+        for (const name of names) row[name] = toSafeMs(r[name])
+        return row
+      })
 
+      setAlgos(names)
       setData(rounds)
     } catch (e) {
       setErr(e.message)
@@ -148,7 +160,7 @@ function PerformanceChart() {
   const yDomain = useMemo(() => {
     const vals = []
     for (const r of data) {
-      for (const k of ['bruteforce', 'nearest_neighbor', 'mst_prim', 'random_search']) {
+      for (const k of algos) {
         const v = r?.[k]
         if (v != null && Number.isFinite(v) && v > 0) vals.push(v)
       }
@@ -157,7 +169,7 @@ function PerformanceChart() {
     const min = Math.min(...vals)
     const max = Math.max(...vals)
     return [min * 0.8, max * 1.2]
-  }, [data])
+  }, [data, algos])
 
   return (
     <div className="panel-body">
@@ -222,38 +234,18 @@ function PerformanceChart() {
 
                 <Legend />
 
-                <Line
-                  type="monotone"
-                  dataKey="bruteforce"
-                  name="Brute Force"
-                  dot={false}
-                  stroke={ALGO_COLORS.bruteforce}
-                  strokeWidth={2}
-                />
-                <Line
-                  type="monotone"
-                  dataKey="nearest_neighbor"
-                  name="Nearest Neighbor"
-                  dot={false}
-                  stroke={ALGO_COLORS.nearest_neighbor}
-                  strokeWidth={2}
-                />
-                <Line
-                  type="monotone"
-                  dataKey="mst_prim"
-                  name="MST (Prim)"
-                  dot={false}
-                  stroke={ALGO_COLORS.mst_prim}
-                  strokeWidth={2}
-                />
-                <Line
-                  type="monotone"
-                  dataKey="random_search"
-                  name="Random Search"
-                  dot={false}
-                  stroke={ALGO_COLORS.random_search}
-                  strokeWidth={2}
-                />
+                {algos.map((name, i) => (
+                  <Line
+                    key={name}
+                    type="monotone"
+                    dataKey={name}
+                    name={formatAlgoName(name)}
+                    dot={false}
+                    connectNulls
+                    stroke={algoColor(name, i)}
+                    strokeWidth={2}
+                  />
+                ))}
               </LineChart>
             </ResponsiveContainer>
           </div>
@@ -280,25 +272,25 @@ function PerformanceChart() {
                 <tr>
                   <th>Round</th>
                   <th>Session</th>
-                  <th>Player (only if correct)</th>
+                  <th>Player</th>
                   <th>Home</th>
-                  <th>Brute (ms)</th>
-                  <th>NN (ms)</th>
-                  <th>MST (ms)</th>
-                  <th>Random (ms)</th>
+                  <th>Cities</th>
+                  {algos.map((name) => (
+                    <th key={name}>{formatAlgoName(name)} (ms)</th>
+                  ))}
                 </tr>
               </thead>
               <tbody>
                 {data.map((r, idx) => (
-                  <tr key={r.sessionId}>
+                  <tr key={r.checkId}>
                     <td>{idx + 1}</td>
                     <td>#{r.sessionId}</td>
                     <td>{r.playerName ?? '—'}</td>
                     <td>{r.homeCity || '—'}</td>
-                    <td>{fmt(r.bruteforce)}</td>
-                    <td>{fmt(r.nearest_neighbor)}</td>
-                    <td>{fmt(r.mst_prim)}</td>
-                    <td>{fmt(r.random_search)}</td>
+                    <td>{r.cities ?? '—'}</td>
+                    {algos.map((name) => (
+                      <td key={name}>{fmt(r[name])}</td>
+                    ))}
                   </tr>
                 ))}
               </tbody>
@@ -322,6 +314,128 @@ function toSafeMs(v) {
   return Math.max(n, 0.001)
 }
 
+function LiveSolver() {
+  const [points, setPoints] = useState([])
+  const [running, setRunning] = useState(false)
+  const [cityCount, setCityCount] = useState(500)
+  const [source, setSource] = useState(null)
+
+  const stop = () => {
+    source?.close()
+    setSource(null)
+    setRunning(false)
+  }
+
+  const start = () => {
+    stop()
+    setPoints([])
+    const es = new EventSource(`${API_BASE}/solve-stream?n=${cityCount}&budgetMs=10000`)
+    es.addEventListener('improvement', (ev) => {
+      const p = JSON.parse(ev.data)
+      setPoints((prev) => [...prev, { elapsedMs: Number(p.elapsedMs.toFixed(1)), distance: p.distance }])
+    })
+    es.addEventListener('done', () => {
+      es.close()
+      setSource(null)
+      setRunning(false)
+    })
+    es.onerror = () => {
+      es.close()
+      setSource(null)
+      setRunning(false)
+    }
+    setSource(es)
+    setRunning(true)
+  }
+
+  useEffect(() => () => source?.close(), [source])
+
+  const best = points.length ? points[points.length - 1].distance : null
+
+  return (
+    <div className="panel-body">
+      <div className="button-row" style={{ marginBottom: 10, alignItems: 'center' }}>
+        <input
+          type="number"
+          min={10}
+          max={5000}
+          value={cityCount}
+          onChange={(e) => setCityCount(Number(e.target.value))}
+          disabled={running}
+          style={{ width: 100 }}
+        />
+        <button className="btn btn-primary" onClick={running ? stop : start}>
+          {running ? 'Stop' : 'Solve random instance'}
+        </button>
+        <span className="badge badge-soft">{best == null ? 'No tour yet' : `Best: ${best}`}</span>
+      </div>
+
+      {!!points.length && (
+        <div style={{ width: '100%', height: 260 }}>
+          <ResponsiveContainer>
+            <LineChart data={points} margin={{ top: 10, right: 20, left: 10, bottom: 10 }}>
+              <CartesianGrid strokeDasharray="3 3" />
+              <XAxis dataKey="elapsedMs" unit=" ms" />
+              <YAxis domain={['auto', 'auto']} />
+              <Tooltip />
+              <Line type="stepAfter" dataKey="distance" stroke={ALGO_COLORS.nearest_neighbor} dot={false} isAnimationActive={false} />
+            </LineChart>
+          </ResponsiveContainer>
+        </div>
+      )}
+    </div>
+  )
+}
+
+function ConvergenceChart({ algorithms }) {
+  // best distance so far against the engine's own step count: samples for
+  // random search, iterations for annealing and ant colony, generations for
+  // the genetic algorithm; a log axis puts them side by side
+  const series = Object.entries(algorithms || {})
+    .filter(([, info]) => info.convergence?.length)
+    .map(([name, info]) => {
+      const unit = Object.keys(info.convergence[0]).find((k) => k !== 'distance')
+      const points = info.convergence.map((p) => ({ step: p[unit] + 1, distance: p.distance }))
+      return { name, unit, points }
+    })
+
+  if (!series.length) return null
+
+  return (
+    <div style={{ width: '100%', height: 280 }}>
+      <ResponsiveContainer>
+        <LineChart margin={{ top: 10, right: 20, left: 10, bottom: 10 }}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis
+            dataKey="step"
+            type="number"
+            scale="log"
+            domain={['auto', 'auto']}
+            allowDuplicatedCategory={false}
+            label={{ value: 'Step (log)', position: 'insideBottomRight', offset: -4 }}
+          />
+          <YAxis domain={['auto', 'auto']} label={{ value: 'Best (km)', angle: -90, position: 'insideLeft' }} />
+          <Tooltip labelFormatter={(step) => `Step ${step}`} />
+          <Legend />
+          {series.map((s, i) => (
+            <Line
+              key={s.name}
+              data={s.points}
+              dataKey="distance"
+              name={`${formatAlgoName(s.name)} (${s.unit})`}
+              type="stepAfter"
+              dot={s.points.length === 1}
+              stroke={algoColor(s.name, i)}
+              strokeWidth={2}
+              isAnimationActive={false}
+            />
+          ))}
+        </LineChart>
+      </ResponsiveContainer>
+    </div>
+  )
+}
+
 function ComplexityInfo() {
   const [data, setData] = useState(null)
   const [loading, setLoading] = useState(false)
@@ -351,22 +465,12 @@ function ComplexityInfo() {
   return (
     <div className="panel-body">
       <ul className="complexity-list">
-        <li>
-          <span className="complexity-title">Brute Force (Exact)</span>
-          <span className="complexity-body">{data.bruteforce}</span>
-        </li>
-        <li>
-          <span className="complexity-title">MST using Prim’s Algorithm</span>
-          <span className="complexity-body">{data.mst_prim}</span>
-        </li>
-        <li>
-          <span className="complexity-title">Nearest Neighbor (Greedy)</span>
-          <span className="complexity-body">{data.nearest_neighbor}</span>
-        </li>
-        <li>
-          <span className="complexity-title">Random Search (Monte Carlo)</span>
-          <span className="complexity-body">{data.random_search}</span>
-        </li>
+        {Object.entries(data).map(([name, text]) => (
+          <li key={name}>
+            <span className="complexity-title">{formatAlgoName(name)}</span>
+            <span className="complexity-body">{text}</span>
+          </li>
+        ))}
       </ul>
     </div>
   )
@@ -420,6 +524,7 @@ export default function App() {
       const data = await res.json()
       if (!res.ok) throw new Error(data.error || 'Failed to start game')
 
+      setSessionId(data.sessionId)
       setCities(data.cities)
       setHomeCity(data.homeCity)
       setDistanceMatrix(data.distanceMatrix)
@@ -458,7 +563,7 @@ export default function App() {
     setError(null)
     setResult(null)
 
-    if (!homeCity || !distanceMatrix?.length) return setError('Start a new round first.')
+    if (!sessionId || !homeCity) return setError('Start a new round first.')
     if (!playerName.trim()) return setError('Please enter your player name.')
     if (routeBetween.length === 0) return setError('Build a route by clicking on selected cities.')
 
@@ -470,15 +575,13 @@ export default function App() {
         body: JSON.stringify({
           playerName,
           routeBetween,
-          homeCity,
-          distanceMatrix,
+          sessionId,
         }),
       })
       const data = await res.json()
       if (!res.ok) throw new Error(data.error || 'Failed to check answer')
 
       setResult(data)
-      setSessionId(data.sessionId ?? null)
     } catch (e) {
       setError(e.message)
     } finally {
@@ -528,7 +631,7 @@ export default function App() {
 
         <div className="badge-row">
           <span className="badge badge-outline">
-            {sessionId ? `Session #${sessionId}` : 'No submitted session yet'}
+            {sessionId ? `Session #${sessionId}` : 'No active session yet'}
           </span>
           {homeCity && (
             <span className="badge badge-home">
@@ -720,9 +823,13 @@ export default function App() {
                 </div>
               ) : (
                 <div className="panel-body">
-                  <span className={'result-pill ' + (result.correct ? 'result-pill-win' : 'result-pill-lose')}>
-                    {result.correct ? 'Perfect Route!' : 'Better path exists'}
-                  </span>
+                  {result.exact ? (
+                    <span className={'result-pill ' + (result.correct ? 'result-pill-win' : 'result-pill-lose')}>
+                      {result.correct ? 'Perfect Route!' : 'Better path exists'}
+                    </span>
+                  ) : (
+                    <span className="result-pill result-pill-ungraded">Not graded</span>
+                  )}
 
                   <p className="result-message" style={{ marginTop: 10 }}>
                     {result.message}
@@ -737,7 +844,7 @@ export default function App() {
                       </p>
                     </div>
                     <div className="info-card">
-                      <h3>Optimal Route</h3>
+                      <h3>{result.exact ? 'Optimal Route' : 'Best Route Found'}</h3>
                       <p className="route-text">{result.optimalRoute.join(' → ')}</p>
                       <p className="metric">
                         Distance: <span>{result.optimalDistance} km</span>
@@ -753,6 +860,7 @@ export default function App() {
                           <th>Algorithm</th>
                           <th>Route</th>
                           <th>Distance</th>
+                          <th>Gap ≤</th>
                           <th>Time (ms)</th>
                         </tr>
                       </thead>
@@ -762,6 +870,7 @@ export default function App() {
                             <td className="algo-name">{formatAlgoName(name)}</td>
                             <td>{info.route.join(' → ')}</td>
                             <td>{info.distance}</td>
+                            <td>{info.gapPct == null ? 'n/a' : `${info.gapPct.toFixed(1)}%`}</td>
                             <td>{info.durationMs.toFixed(3)}</td>
                           </tr>
                         ))}
@@ -769,8 +878,19 @@ export default function App() {
                     </table>
                   </div>
 
+                  {Object.values(result.algorithms).some((info) => info.convergence?.length) && (
+                    <>
+                      <h3 className="section-heading">Convergence</h3>
+                      <ConvergenceChart algorithms={result.algorithms} />
+                    </>
+                  )}
+
                   <p className="small-note" style={{ marginTop: 10 }}>
-                    Want charts? Switch to <strong>Analytics</strong> tab.
+                    {result.lowerBound == null
+                      ? 'The Held-Karp lower bound ran out of time, so no gap is shown (n/a).'
+                      : `Gaps are measured against the Held-Karp lower bound (${result.lowerBound} km), so they can only overstate how far a route is from optimal.`}{' '}
+                    Want charts? Switch to{' '}
+                    <strong>Analytics</strong> tab.
                   </p>
                 </div>
               )}
@@ -791,6 +911,16 @@ export default function App() {
             </div>
           </section>
 
+          <section className="analytics-row">
+            <div className="panel">
+              <div className="panel-header">
+                <h2>Live Solver</h2>
+                <span className="badge badge-soft">Anytime Local Search</span>
+              </div>
+              <LiveSolver />
+            </div>
+          </section>
+
           <section className="analytics-row">
             <div className="panel panel-complexity">
               <div className="panel-header">
@@ -814,8 +944,24 @@ function formatAlgoName(name) {
       return 'MST using Prim’s'
     case 'nearest_neighbor':
       return 'Nearest Neighbor'
+    case 'greedy_edge':
+      return 'Greedy Edge'
     case 'random_search':
       return 'Random Search'
+    case 'lin_kernighan':
+      return 'Lin-Kernighan (2-opt + Or-opt)'
+    case 'christofides':
+      return 'Christofides (1.5-approx)'
+    case 'simulated_annealing':
+      return 'Simulated Annealing'
+    case 'genetic':
+      return 'Genetic Algorithm'
+    case 'ant_colony':
+      return 'Ant Colony Optimisation'
+    case 'held_karp':
+      return 'Held-Karp (Exact DP)'
+    case 'held_karp_lower_bound':
+      return 'Held-Karp Lower Bound'
     default:
       return name
   }